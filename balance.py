@@ -0,0 +1,213 @@
+"""Batch simulator for balance tuning: many seeded games across all cores.
+
+Each game runs in simulation-only mode (no window, no drawing, no frame cap)
+with both ships flown by a simple AI policy until game over or a tick limit.
+A ProcessPoolExecutor spreads the games of a parameter grid over worker
+processes; results are aggregated per grid point into a table of survival
+time, score and kill rate, and the run reports its throughput in games per
+second. Games are independent and share nothing, so throughput scales with
+the number of cores.
+
+Run with:
+    python balance.py                                        # default grid
+    python balance.py -g 200 --grid enemy_spawn_delay=30,60,90 --grid invulnerable_duration=60,120
+    python balance.py --grid enemy_shoot_delay=40-80,60-120,90-160 --csv results.csv
+    python balance.py -g 400 --scaling                       # games/sec at 1..N workers
+"""
+import argparse
+import csv
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pygame
+from replay import HELD_KEYS, ReplayKeys
+from space_shooter import Game, GameState, SCREEN_WIDTH, SIM_RATE
+
+MAX_TICKS = 5 * 60 * SIM_RATE  # Stop games still running after five simulated minutes
+FIRE_INTERVAL = 8  # Ticks between the policy's shots per ship
+DANGER_DISTANCE = 120  # How far above a ship the policy looks for threats
+
+# Parameters the grid can sweep; enemy_shoot_delay takes "min-max" ranges
+DEFAULT_GRID = {
+    "enemy_spawn_delay": (30, 60, 90),
+    "asteroid_spawn_delay": (60, 120),
+    "enemy_shoot_delay": ((60, 120),),
+    "invulnerable_duration": (120,),
+}
+
+LEFT, RIGHT = (1 << HELD_KEYS.index(pygame.K_LEFT), 1 << HELD_KEYS.index(pygame.K_RIGHT))
+A, D = (1 << HELD_KEYS.index(pygame.K_a), 1 << HELD_KEYS.index(pygame.K_d))
+FIRE_EVENTS = (pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE),
+               pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN))
+
+
+def steer(player, game):
+    """-1, 0 or 1: dodge the nearest threat above the ship, else line up under the lowest enemy"""
+    left, right = player.x, player.x + player.width
+    top = player.y - DANGER_DISTANCE
+    for group in (game.enemy_bullets, game.asteroids, game.enemies):
+        for threat in group:
+            if threat.y > top and threat.x < right + 10 and threat.x + threat.width > left - 10:
+                # Move away from the threat, towards the roomier side near the walls
+                centre = threat.x + threat.width / 2
+                if player.x < 60:
+                    return 1
+                if right > SCREEN_WIDTH - 60:
+                    return -1
+                return 1 if centre < player.x + player.width / 2 else -1
+    if not game.enemies:
+        return 0
+    target = max(game.enemies, key=lambda enemy: enemy.y)
+    offset = target.x + target.width / 2 - (player.x + player.width / 2)
+    return 0 if abs(offset) < 4 else (1 if offset > 0 else -1)
+
+
+def policy(game, tick):
+    """Events and held keys for one tick of AI play"""
+    mask = 0
+    direction = steer(game.player1, game)
+    mask |= LEFT if direction < 0 else RIGHT if direction > 0 else 0
+    direction = steer(game.player2, game)
+    mask |= A if direction < 0 else D if direction > 0 else 0
+    events = FIRE_EVENTS if tick % FIRE_INTERVAL == 0 else ()
+    return events, ReplayKeys(mask)
+
+
+def play_game(params, seed, max_ticks=MAX_TICKS):
+    """Play one simulation-only game with the AI policy and return its statistics"""
+    game = Game(seed=seed, simulate_only=True)
+    for name, value in params.items():
+        setattr(game, name, value)
+    tick = 0
+    while tick < max_ticks and game.state == GameState.PLAYING:
+        events, keys = policy(game, tick)
+        game.handle_events(events)
+        game.update(keys)
+        tick += 1
+    kills = game.score // 10
+    return {"ticks": tick, "score": game.score, "kills": kills, "survived": game.state == GameState.PLAYING}
+
+
+def play_batch(params, seeds, max_ticks):
+    """Play one game per seed (one task per worker round trip)"""
+    return [play_game(params, seed, max_ticks) for seed in seeds]
+
+
+def grid_points(grid):
+    """Every combination of the grid's values as a parameter dict"""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def summarize(params, results):
+    """Aggregate one grid point's games into a results row"""
+    n = len(results)
+    ticks = sum(r["ticks"] for r in results)
+    minutes = ticks / SIM_RATE / 60
+    return dict(params, games=n,
+                survival_s=ticks / n / SIM_RATE,
+                survived=sum(r["survived"] for r in results) / n,
+                score=sum(r["score"] for r in results) / n,
+                kills_per_min=sum(r["kills"] for r in results) / minutes if minutes else 0.0)
+
+
+def run_sweep(grid, games, max_ticks=MAX_TICKS, workers=None, batch=25, base_seed=0):
+    """Play games per grid point across worker processes; return (rows, elapsed seconds)"""
+    points = grid_points(grid)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = []
+        for index, params in enumerate(points):
+            # Every grid point plays the same seeds, so differences come from the parameters
+            seeds = [base_seed + i for i in range(games)]
+            for chunk in range(0, games, batch):
+                futures.append((index, pool.submit(play_batch, params, seeds[chunk:chunk + batch], max_ticks)))
+        results = [[] for _ in points]
+        for index, future in futures:
+            results[index].extend(future.result())
+    elapsed = time.perf_counter() - start
+    return [summarize(params, rows) for params, rows in zip(points, results)], elapsed
+
+
+def parse_value(text):
+    """Grid value: an int, or a "min-max" range"""
+    if "-" in text:
+        low, high = text.split("-")
+        return (int(low), int(high))
+    return int(text)
+
+
+def format_value(value):
+    """Grid value as written on the command line"""
+    return f"{value[0]}-{value[1]}" if isinstance(value, tuple) else str(value)
+
+
+def print_table(rows):
+    """Results table, one row per grid point"""
+    names = [key for key in rows[0] if key in DEFAULT_GRID]
+    columns = names + ["games", "survival_s", "survived", "score", "kills_per_min"]
+    widths = [max(len(name), 8) for name in columns]
+    print("  ".join(f"{name:>{width}}" for name, width in zip(columns, widths)))
+    for row in rows:
+        cells = []
+        for name, width in zip(columns, widths):
+            value = row[name]
+            if name == "survived":
+                cells.append(f"{value:>{width}.0%}")
+            elif isinstance(value, float):
+                cells.append(f"{value:>{width}.1f}")
+            else:
+                cells.append(f"{format_value(value):>{width}}")
+        print("  ".join(cells))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parallel balance sweep over simulation-only games")
+    parser.add_argument("-g", "--games", type=int, default=100, help="games per grid point")
+    parser.add_argument("--grid", action="append", metavar="NAME=V1,V2,...",
+                        help=f"parameter values to sweep (repeatable): {', '.join(DEFAULT_GRID)}")
+    parser.add_argument("--max-ticks", type=int, default=MAX_TICKS)
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0, help="first seed; games use consecutive seeds")
+    parser.add_argument("--csv", metavar="PATH", help="also write the results table as CSV")
+    parser.add_argument("--scaling", action="store_true",
+                        help="measure games/sec with 1, 2, 4 ... workers on the first grid point")
+    args = parser.parse_args(argv)
+
+    grid = dict(DEFAULT_GRID)
+    for spec in args.grid or ():
+        name, _, values = spec.partition("=")
+        if name not in DEFAULT_GRID:
+            parser.error(f"unknown parameter {name!r}")
+        grid[name] = tuple(parse_value(value) for value in values.split(","))
+
+    if args.scaling:
+        first = {name: values[:1] for name, values in grid.items()}
+        workers = 1
+        base = None
+        while True:
+            _, elapsed = run_sweep(first, args.games, args.max_ticks, workers, base_seed=args.seed)
+            rate = args.games / elapsed
+            base = base or rate
+            print(f"{workers:>3} workers: {rate:8.1f} games/s  ({rate / base:.2f}x)")
+            if workers >= args.workers:
+                break
+            workers = min(workers * 2, args.workers)
+        return
+
+    rows, elapsed = run_sweep(grid, args.games, args.max_ticks, args.workers, base_seed=args.seed)
+    print_table(rows)
+    total = args.games * len(rows)
+    print(f"{total} games in {elapsed:.1f} s on {args.workers} workers: {total / elapsed:.1f} games/s")
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows({key: format_value(value) if isinstance(value, tuple) else value
+                              for key, value in row.items()} for row in rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Asteroid draw time versus asteroid count, before and after the rotation atlas.
+
+Run with: python benchmarks/bench_asteroids.py [--steps 64] [--frames 120]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+import space_shooter
+from space_shooter import ASSETS, Asteroid, SCREEN_WIDTH, SCREEN_HEIGHT
+
+COUNTS = (10, 50, 100, 500, 1000)
+
+def legacy_draw(asteroid, screen):
+    """The original per-frame Surface + polygon + rotate path"""
+    surface = pygame.Surface((asteroid.width, asteroid.height), pygame.SRCALPHA)
+    space_shooter.draw_asteroid_shape(surface, asteroid.width, asteroid.height)
+    rotated = pygame.transform.rotate(surface, asteroid.rotation)
+    rect = rotated.get_rect(center=(asteroid.x + asteroid.width // 2, asteroid.y + asteroid.height // 2))
+    screen.blit(rotated, rect)
+
+def atlas_draw(asteroid, screen):
+    """One blit of the pre-rotated atlas frame, as draw_entities submits it"""
+    screen.blit(*asteroid.blit_args())
+
+def time_draw(draw, asteroids, screen, frames):
+    """Average milliseconds to draw every asteroid once"""
+    start = time.perf_counter()
+    for _ in range(frames):
+        for asteroid in asteroids:
+            asteroid.update()
+            draw(asteroid, screen)
+    return (time.perf_counter() - start) * 1000 / frames
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=space_shooter.ASTEROID_ROTATION_STEPS,
+                        help="rotation frames per full turn")
+    parser.add_argument("--frames", type=int, default=120)
+    args = parser.parse_args()
+
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    ASSETS.set_rotation_steps(args.steps)
+    random.seed(0)
+    # Build every atlas up front, as AssetLoader does while the loading bar shows, so it is not timed
+    for w in range(space_shooter.ASTEROID_MIN_SIZE, space_shooter.ASTEROID_MAX_SIZE + 1):
+        for h in range(space_shooter.ASTEROID_MIN_SIZE, space_shooter.ASTEROID_MAX_SIZE + 1):
+            ASSETS.rotation_atlas(w, h)
+
+    print(f"rotation steps: {args.steps}")
+    print(f"{'asteroids':>10} {'before ms':>10} {'after ms':>10} {'speedup':>8}")
+    for count in COUNTS:
+        asteroids = [Asteroid(random.randint(0, SCREEN_WIDTH - 40), random.randint(0, SCREEN_HEIGHT))
+                     for _ in range(count)]
+        before = time_draw(legacy_draw, asteroids, screen, args.frames)
+        after = time_draw(atlas_draw, asteroids, screen, args.frames)
+        print(f"{count:>10} {before:>10.3f} {after:>10.3f} {before / after:>7.1f}x")
+
+    atlas_bytes = sum(atlas.memory_bytes() for atlas in ASSETS.atlases.values())
+    print(f"atlas memory: {len(ASSETS.atlases)} size classes, {atlas_bytes / 1024:.0f} KiB")
+
+if __name__ == "__main__":
+    main()
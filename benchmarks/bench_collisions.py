@@ -0,0 +1,100 @@
+"""Collision time versus entity count, before and after the spatial-hash broadphase.
+
+Both sides test rectangles only: PIXEL_COLLISIONS and particle effects are
+off, so "after" times the broadphase alone (bench_pixel_collisions.py covers
+the mask tests).
+
+Run with: python benchmarks/bench_collisions.py [--repeat 20]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import space_shooter
+from space_shooter import Asteroid, Enemy, Game, SCREEN_WIDTH, SCREEN_HEIGHT
+
+COUNTS = (10, 100, 1000)
+
+def legacy_check_collisions(game):
+    """The original nested-loop check_collisions (releasing removed projectiles to their pools, as now)"""
+    for bullet in game.bullets[:]:
+        for enemy in game.enemies[:]:
+            if bullet.get_rect().colliderect(enemy.get_rect()):
+                game.bullets.remove(bullet)
+                game.bullet_pool.release(bullet)
+                game.enemies.remove(enemy)
+                game.score += 10
+                break
+    if game.invulnerable_timer > 0:
+        game.invulnerable_timer -= 1
+        return
+    for enemy in game.enemies:
+        if game.player1.get_rect().colliderect(enemy.get_rect()) or game.player2.get_rect().colliderect(enemy.get_rect()):
+            game.lose_life()
+            return
+    for bullet in game.enemy_bullets[:]:
+        if game.player1.get_rect().colliderect(bullet.get_rect()) or game.player2.get_rect().colliderect(bullet.get_rect()):
+            game.enemy_bullets.remove(bullet)
+            game.enemy_bullet_pool.release(bullet)
+            game.lose_life()
+            return
+    for asteroid in game.asteroids:
+        if game.player1.get_rect().colliderect(asteroid.get_rect()) or game.player2.get_rect().colliderect(asteroid.get_rect()):
+            game.lose_life()
+            return
+
+def populate(count, rng):
+    """count entities of each kind scattered over the upper screen, away from the players.
+
+    Bullets and enemy bullets are kept as positions and taken from the game's pools per pass.
+    """
+    def pos():
+        return rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT - 120)
+    return ([pos() for _ in range(count)], [Enemy(*pos()) for _ in range(count)],
+            [pos() for _ in range(count)], [Asteroid(*pos()) for _ in range(count)])
+
+def reset(game, state):
+    """Put a fresh copy of state into the game, returning the last pass's projectiles to their pools"""
+    bullets, enemies, enemy_bullets, asteroids = state
+    game.clear_projectiles()
+    game.bullets.extend(game.bullet_pool.acquire(x, y) for x, y in bullets)
+    game.enemy_bullets.extend(game.enemy_bullet_pool.acquire(x, y) for x, y in enemy_bullets)
+    game.enemies, game.asteroids = list(enemies), list(asteroids)
+
+def time_check(check, game, state, repeat):
+    """Average milliseconds for one collision pass over a fresh copy of state"""
+    total = 0.0
+    for _ in range(repeat):
+        reset(game, state)
+        game.score = 0
+        game.invulnerable_timer = 0
+        start = time.perf_counter()
+        check(game)
+        total += time.perf_counter() - start
+    return total * 1000 / repeat
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    space_shooter.PIXEL_COLLISIONS = False
+    game = Game(display_scaling="native")
+    game.effects = False
+    rng = random.Random(0)
+    print(f"{'per group':>9} {'before ms':>10} {'after ms':>10} {'speedup':>8}")
+    for count in COUNTS:
+        state = populate(count, rng)
+        before = time_check(legacy_check_collisions, game, state, args.repeat)
+        after = time_check(Game.check_collisions, game, state, args.repeat)
+        print(f"{count:>9} {before:>10.3f} {after:>10.3f} {before / after:>7.1f}x")
+    game.clear_projectiles()
+    print(f"pools after the run: bullets {game.bullet_pool.stats()}, enemy bullets {game.enemy_bullet_pool.stats()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Per-frame update cost and memory footprint at 10k live entities.
+
+Compares the original copy-and-remove loops on plain objects with the
+compacting update_entities pass on __slots__ classes.
+
+Run with: python benchmarks/bench_entities.py [--count 10000] [--frames 20]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from space_shooter import (Asteroid, Bullet, Enemy, EnemyBullet, Star, SCREEN_WIDTH, SCREEN_HEIGHT,
+                           update_entities)
+
+KINDS = (Star, Bullet, EnemyBullet, Asteroid, Enemy)
+
+# Subclasses without __slots__ get a per-instance __dict__ again, like the original classes
+LEGACY_KINDS = tuple(type("Legacy" + kind.__name__, (kind,), {}) for kind in KINDS)
+
+def legacy_update(entities):
+    """The original copy-and-remove update loop"""
+    for entity in entities[:]:
+        entity.update()
+        if entity.is_off_screen():
+            entities.remove(entity)
+
+def build(kinds, count, rng, dying):
+    """count entities spread evenly across kinds; a dying fraction leaves the screen next update"""
+    groups = []
+    for kind in kinds:
+        group = []
+        for _ in range(count // len(kinds)):
+            entity = kind(rng.uniform(0, SCREEN_WIDTH), rng.uniform(50, SCREEN_HEIGHT - 50))
+            if rng.random() < dying:
+                entity.y = 1 if isinstance(entity, Bullet) else SCREEN_HEIGHT
+            group.append(entity)
+        groups.append(group)
+    return groups
+
+def time_update(update, kinds, count, frames, dying):
+    """Average milliseconds for one update pass over every group"""
+    rng = random.Random(0)
+    total = 0.0
+    for _ in range(frames):
+        groups = build(kinds, count, rng, dying)
+        start = time.perf_counter()
+        for group in groups:
+            update(group)
+        total += time.perf_counter() - start
+    return total * 1000 / frames
+
+def footprint(kinds, count):
+    """Bytes allocated to hold count live entities"""
+    tracemalloc.start()
+    groups = build(kinds, count, random.Random(0), 0)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del groups
+    return size
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--frames", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{args.count} live entities across {len(KINDS)} classes")
+    print(f"{'dying per frame':>16} {'before ms':>10} {'after ms':>10} {'speedup':>8}")
+    for dying in (0.0, 0.1, 0.5):
+        before = time_update(legacy_update, LEGACY_KINDS, args.count, args.frames, dying)
+        after = time_update(update_entities, KINDS, args.count, args.frames, dying)
+        print(f"{dying:>16.0%} {before:>10.2f} {after:>10.2f} {before / after:>7.1f}x")
+
+    before = footprint(LEGACY_KINDS, args.count)
+    after = footprint(KINDS, args.count)
+    print(f"memory: {before / 1024:.0f} KiB before, {after / 1024:.0f} KiB after "
+          f"({before / args.count:.0f} -> {after / args.count:.0f} bytes per entity)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Environment steps per second for the gym-style wrappers in env.py.
+
+Steps N environments with random actions, in process and across worker
+processes, with feature and pixel observations, and reports aggregate steps
+per second.
+
+Run with: python benchmarks/bench_env.py [--envs 8] [--workers 4] [--steps 500]
+"""
+import argparse
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from env import ACTION_COUNT, VectorEnv
+
+def measure(n, workers, obs, steps):
+    """Aggregate steps per second of a VectorEnv over steps lockstep steps"""
+    rng = np.random.default_rng(0)
+    envs = VectorEnv(n, workers=workers, obs=obs)
+    try:
+        envs.reset()
+        for _ in range(steps):
+            envs.step(rng.integers(0, ACTION_COUNT, size=(n, 2)).tolist())
+        return envs.steps_per_second()
+    finally:
+        envs.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--envs", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--steps", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{args.envs} environments, {args.steps} lockstep steps, random actions")
+    print(f"{'observation':>12} {'workers':>8} {'steps/s':>10}")
+    for obs in ("features", "pixels"):
+        for workers in (0, args.workers):
+            rate = measure(args.envs, workers, obs, args.steps)
+            print(f"{obs:>12} {workers or 'in-proc':>8} {rate:>10.0f}")
+
+if __name__ == "__main__":
+    main()
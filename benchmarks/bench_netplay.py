@@ -0,0 +1,70 @@
+"""Bandwidth and input latency of the networked mode (netplay.py) over localhost.
+
+Runs a server and two AI-flown headless clients in one process for each
+simulated network condition, and reports per-client bandwidth, the mean
+size of a state packet against the uncompressed state, how many states had
+to be sent in full, and input-to-state latency percentiles. Every decoded
+state is also checked against the server's copy.
+
+Run with: python benchmarks/bench_netplay.py [--seconds 10]
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from netplay import NET_PORT, bot_controller, start_client, start_server
+
+# (one-way latency ms, jitter ms, loss fraction)
+CONDITIONS = ((0, 0, 0.0), (20, 5, 0.01), (50, 10, 0.05), (100, 20, 0.10))
+
+async def measure(seconds, latency, jitter, loss, port):
+    """Client statistics plus state-size and correctness figures for one network condition"""
+    link = {"latency_ms": latency, "jitter_ms": jitter, "loss": loss}
+    server, server_transport = await start_server(port=port, seed=1, link=dict(link, seed=0))
+    serving = asyncio.ensure_future(server.serve())
+    clients = []
+    try:
+        for i in range(2):
+            clients.append(await start_client(port=port, render=False, controller=bot_controller,
+                                              link=dict(link, seed=i + 1)))
+        await asyncio.gather(*(client.play(duration=seconds) for client, _ in clients))
+    finally:
+        serving.cancel()
+        for _, transport in clients:
+            transport.close()
+        server_transport.close()
+    states = server.history.values()
+    raw = sum(len(state) for state in states) / len(states)
+    sent = server.stats()
+    rows = []
+    for client, _ in clients:
+        stats = client.stats()
+        checked = [tick for tick in client.states if tick in server.history]
+        stats["mismatches"] = sum(client.states[tick] != server.history[tick] for tick in checked)
+        stats["raw_state_bytes"] = raw
+        stats["full_states"] = sent.get(stats["ship"], {}).get("full_states", 0)
+        rows.append(stats)
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=10.0, help="play time per network condition")
+    parser.add_argument("--port", type=int, default=NET_PORT + 1)
+    args = parser.parse_args()
+
+    print(f"{'latency':>8} {'loss':>5} {'ship':>4} {'KiB/s':>7} {'B/state':>8} {'raw B':>6} "
+          f"{'full':>5} {'p50 ms':>7} {'p95 ms':>7} {'bad':>4}")
+    for i, (latency, jitter, loss) in enumerate(CONDITIONS):
+        rows = asyncio.run(measure(args.seconds, latency, jitter, loss, args.port + i))
+        for stats in rows:
+            print(f"{f'{latency}+-{jitter}':>8} {loss:>5.0%} {stats['ship']:>4} {stats['kib_per_s']:>7.1f} "
+                  f"{stats['mean_state_bytes']:>8.0f} {stats['raw_state_bytes']:>6.0f} {stats['full_states']:>5} "
+                  f"{stats['latency_p50_ms']:>7.0f} {stats['latency_p95_ms']:>7.0f} "
+                  f"{stats['mismatches'] + stats['undecodable']:>4}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Per-frame particle update and draw cost at 10k live particles.
+
+Compares one Python object per particle (updated in a loop and drawn with one
+fill each, the way Star-style entities work) with the array-backed
+ParticleSystem, against the 16.7 ms frame budget at 60 FPS.
+
+Run with: python benchmarks/bench_particles.py [--count 10000] [--frames 120]
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from particles import PARTICLE_DRAG, PARTICLE_GRAVITY, PARTICLE_SIZE, ParticleSystem
+from space_shooter import SCREEN_WIDTH, SCREEN_HEIGHT
+
+FRAME_BUDGET_MS = 1000 / 60
+COLORS = ((255, 140, 0), (100, 100, 100), (0, 255, 255), (0, 255, 0))
+
+class ObjectParticle:
+    """One particle per object, for comparison"""
+    __slots__ = ("x", "y", "vx", "vy", "life", "max_life", "color")
+
+    def __init__(self, x, y, rng):
+        angle = rng.uniform(0, 2 * math.pi)
+        speed = rng.uniform(1.0, 4.0)
+        self.x, self.y = x, y
+        self.vx, self.vy = math.cos(angle) * speed, math.sin(angle) * speed
+        self.life = self.max_life = rng.uniform(20, 45)
+        self.color = rng.choice(COLORS)
+
+    def update(self):
+        self.x += self.vx
+        self.y += self.vy
+        self.vx *= PARTICLE_DRAG
+        self.vy = self.vy * PARTICLE_DRAG + PARTICLE_GRAVITY
+        self.life -= 1
+
+    def draw(self, screen):
+        fade = self.life / self.max_life
+        r, g, b = self.color
+        screen.fill((int(r * fade), int(g * fade), int(b * fade)), (int(self.x), int(self.y),
+                                                                 PARTICLE_SIZE, PARTICLE_SIZE))
+
+def run_objects(screen, count, frames):
+    """Average update and draw milliseconds with one object per particle"""
+    rng = random.Random(0)
+    particles = []
+    update_ms = draw_ms = 0.0
+    for _ in range(frames):
+        while len(particles) < count:
+            particles.append(ObjectParticle(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT), rng))
+        start = time.perf_counter()
+        kept = 0
+        for particle in particles:
+            particle.update()
+            if particle.life > 0 and 0 <= particle.x < SCREEN_WIDTH and 0 <= particle.y < SCREEN_HEIGHT:
+                particles[kept] = particle
+                kept += 1
+        del particles[kept:]
+        middle = time.perf_counter()
+        screen.fill((0, 0, 0))
+        for particle in particles:
+            particle.draw(screen)
+        end = time.perf_counter()
+        update_ms += (middle - start) * 1000
+        draw_ms += (end - middle) * 1000
+    return update_ms / frames, draw_ms / frames
+
+def run_arrays(screen, count, frames):
+    """Average update and draw milliseconds with the array-backed ParticleSystem"""
+    rng = random.Random(0)
+    system = ParticleSystem(SCREEN_WIDTH, SCREEN_HEIGHT, capacity=count, seed=0)
+    update_ms = draw_ms = 0.0
+    for _ in range(frames):
+        # Top back up to the cap in bursts, like explosions would
+        while len(system) < count:
+            system.emit(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT), 200, rng.choice(COLORS))
+        start = time.perf_counter()
+        system.update()
+        middle = time.perf_counter()
+        screen.fill((0, 0, 0))
+        system.draw(screen)
+        end = time.perf_counter()
+        update_ms += (middle - start) * 1000
+        draw_ms += (end - middle) * 1000
+    return update_ms / frames, draw_ms / frames
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--frames", type=int, default=120)
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    print(f"{args.count} live particles, {args.frames} frames, budget {FRAME_BUDGET_MS:.1f} ms/frame")
+    print(f"{'':>10} {'update ms':>10} {'draw ms':>10} {'total ms':>10} {'budget':>8}")
+    for name, run in (("objects", run_objects), ("arrays", run_arrays)):
+        update_ms, draw_ms = run(screen, args.count, args.frames)
+        total = update_ms + draw_ms
+        print(f"{name:>10} {update_ms:>10.2f} {draw_ms:>10.2f} {total:>10.2f} {total / FRAME_BUDGET_MS:>7.0%}")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Cost and effect of confirming player hits with sprite masks (PIXEL_COLLISIONS).
+
+First, hazards are scattered right around the ships, the worst case, where
+most of them pass the rect broadphase and reach the mask test. For each kind
+of hazard it reports the time of a rect test and of a rect test followed by
+the mask test for every ship-hazard pair, and the share of rect overlaps the
+masks reject as near misses.
+
+Then a swarm run streams enemies, enemy bullets and asteroids through two
+ships pinned at the bottom of the screen. The ships are never invulnerable,
+and a hit costs no life and clears nothing, so every frame runs the player
+checks against a crowd and the mask tests really run. It reports the
+collision pass per frame with rects only and with masks, and the frames in
+which each found a hit. Last, it runs the harness scenarios both ways and
+compares the collisions phase. In those, the ships rarely touch anything,
+and they are invulnerable in dense_wave.
+
+Run with: python benchmarks/bench_pixel_collisions.py [--pairs 5000] [--frames 600]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import space_shooter
+from harness import SCENARIOS, ScriptedKeys, percentile, run_scenario
+from space_shooter import Asteroid, Enemy, EnemyBullet, Game, masks_overlap
+
+HAZARDS = (
+    ("enemy", lambda x, y, rng: Enemy(x, y, rng)),
+    ("enemy bullet", lambda x, y, rng: EnemyBullet(x, y)),
+    ("asteroid", lambda x, y, rng: Asteroid(x, y, rng)),
+)
+
+def crowd(game, make, count, rng):
+    """count (ship, hazard) pairs with the hazard near or overlapping the ship"""
+    pairs = []
+    for _ in range(count):
+        player = rng.choice((game.player1, game.player2))
+        pairs.append((player, make(player.x + rng.uniform(-40, 40), player.y + rng.uniform(-40, 30), rng)))
+    return pairs
+
+def time_pairs(pairs, pixel):
+    """Microseconds per pair for the hit test, and how many pairs it reported as hits"""
+    hits = 0
+    start = time.perf_counter()
+    for player, hazard in pairs:
+        if player.get_rect().colliderect(hazard.get_rect()):
+            if not pixel or masks_overlap(*player.collision_mask(), *hazard.collision_mask()):
+                hits += 1
+    return (time.perf_counter() - start) * 1e6 / len(pairs), hits
+
+def swarm(frames, pixel):
+    """Collision pass times (ms) per frame with hazards streaming through pinned ships, and frames with a hit"""
+    space_shooter.PIXEL_COLLISIONS = pixel
+    game = Game(seed=1, display_scaling="native")
+    hits = []
+    game.lose_life = lambda: hits.append(1)  # Keep the ships and the crowd in place
+    rng = random.Random(0)
+    keys = ScriptedKeys()
+    pinned = [(player.x, player.y) for player in (game.player1, game.player2)]
+    left, right = pinned[0][0] - 40, pinned[1][0] + 80
+    top = pinned[0][1] - 120
+    times = []
+    for _ in range(frames):
+        game.enemies.append(Enemy(rng.uniform(left, right), top, rng))
+        game.asteroids.append(Asteroid(rng.uniform(left, right), top, rng))
+        game.add_projectile(game.enemy_bullets, game.enemy_bullet_pool,
+                            game.enemy_bullet_pool.acquire(rng.uniform(left, right), top))
+        game.move_entities(keys)
+        for player, (x, y) in zip((game.player1, game.player2), pinned):
+            player.x, player.y = x, y
+        game.invulnerable_timer = 0
+        start = time.perf_counter()
+        game.check_collisions()
+        times.append((time.perf_counter() - start) * 1000)
+    return sorted(times), len(hits)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pairs", type=int, default=5000, help="random ship-hazard pairs per kind of hazard")
+    parser.add_argument("--frames", type=int, default=600, help="frames per harness scenario")
+    args = parser.parse_args()
+
+    game = Game(seed=1, display_scaling="native")
+    rng = random.Random(0)
+    print("hazards crowding the ships, per ship-hazard pair")
+    print(f"{'hazard':>12} {'rects us':>9} {'masks us':>9} {'rect hits':>10} {'near miss':>10}")
+    for name, make in HAZARDS:
+        pairs = crowd(game, make, args.pairs, rng)
+        time_pairs(pairs, True)  # Build the masks outside the timing
+        rects_us, rect_hits = time_pairs(pairs, False)
+        masks_us, mask_hits = time_pairs(pairs, True)
+        rejected = (rect_hits - mask_hits) / rect_hits if rect_hits else 0.0
+        print(f"{name:>12} {rects_us:>9.2f} {masks_us:>9.2f} {rect_hits:>10} {rejected:>10.0%}")
+
+    print()
+    print(f"swarm through pinned ships, collision pass over {args.frames} frames")
+    print(f"{'mode':>12} {'p50 ms':>9} {'p95 ms':>9} {'hit frames':>11}")
+    for pixel in (False, True):
+        times, hit_frames = swarm(args.frames, pixel)
+        print(f"{'masks' if pixel else 'rects':>12} {percentile(times, 50):>9.3f} {percentile(times, 95):>9.3f} "
+              f"{hit_frames:>11}")
+
+    print()
+    print("harness scenarios, collisions phase")
+    print(f"{'scenario':>12} {'rects p50':>10} {'masks p50':>10} {'rects p95':>10} {'masks p95':>10}")
+    for name in SCENARIOS:
+        reports = []
+        for pixel in (False, True):
+            space_shooter.PIXEL_COLLISIONS = pixel
+            reports.append(run_scenario(name, args.frames, seed=1)["phases"]["collisions"])
+        rects, masks = reports
+        print(f"{name:>12} {rects['p50']:>10.3f} {masks['p50']:>10.3f} {rects['p95']:>10.3f} {masks['p95']:>10.3f}")
+
+if __name__ == "__main__":
+    main()
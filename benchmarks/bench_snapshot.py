@@ -0,0 +1,70 @@
+"""Snapshot size and capture/restore cost, for sizing the rewind history.
+
+Plays the harness's scripted scenarios and measures Game.snapshot() every
+tick and Game.restore() on a sample of the captured snapshots, then reports
+how many seconds of per-tick history fit in a memory budget.
+
+Run with: python benchmarks/bench_snapshot.py [--frames 600] [--budget-mib 64]
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from harness import SCENARIOS, percentile
+from space_shooter import Game, GameState, SIM_RATE
+
+def measure(name, frames, backend):
+    """Snapshot sizes and capture/restore times (microseconds) over one scenario"""
+    setup, script = SCENARIOS[name]
+    game = Game(backend=backend, seed=1)
+    pygame.event.clear()
+    if setup:
+        setup(game, frames)
+    sizes, captures, snapshots = [], [], []
+    clock = time.perf_counter
+    for frame in range(frames):
+        presses, keys = script(game, frame)
+        if game.state == GameState.GAME_OVER:
+            presses = (pygame.K_r,)
+        game.handle_events([pygame.event.Event(pygame.KEYDOWN, key=key) for key in presses])
+        game.update(keys)
+        start = clock()
+        snapshot = game.snapshot()
+        captures.append((clock() - start) * 1e6)
+        sizes.append(len(snapshot))
+        if frame % 10 == 0:
+            snapshots.append(snapshot)
+    restores = []
+    for snapshot in snapshots:
+        start = clock()
+        game.restore(snapshot)
+        restores.append((clock() - start) * 1e6)
+    return sorted(sizes), sorted(captures), sorted(restores)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--backend", choices=("python", "numpy"), default="python")
+    parser.add_argument("--budget-mib", type=float, default=64, help="memory budget for the rewind history")
+    args = parser.parse_args()
+
+    budget = args.budget_mib * 2 ** 20
+    print(f"{args.backend} backend, {args.frames} ticks per scenario, {args.budget_mib:g} MiB budget")
+    print(f"{'scenario':>12} {'mean KiB':>9} {'max KiB':>8} {'capture p50/p95 us':>19} "
+          f"{'restore p50/p95 us':>19} {'history in budget':>18}")
+    for name in SCENARIOS:
+        sizes, captures, restores = measure(name, args.frames, args.backend)
+        mean = sum(sizes) / len(sizes)
+        seconds = budget / (sizes[-1] * SIM_RATE)
+        print(f"{name:>12} {mean / 1024:>9.1f} {sizes[-1] / 1024:>8.1f} "
+              f"{percentile(captures, 50):>9.0f}/{percentile(captures, 95):<9.0f} "
+              f"{percentile(restores, 50):>9.0f}/{percentile(restores, 95):<9.0f} {seconds:>16.0f} s")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+"""Headless benchmark harness: scripted scenarios with per-phase frame timings.
+
+Runs Game for a fixed number of frames under the SDL dummy video driver with
+scripted input and a fixed random seed. Reports p50/p95/p99 timings for each
+phase (events, update, collisions, snapshot, draw, flip) and frames per
+second, as a table and optionally as JSON for comparing runs. Games keep the
+rewind history as in interactive play, so "snapshot" is its per-tick capture.
+
+Run with:
+    python benchmarks/harness.py                          # every scenario
+    python benchmarks/harness.py -s dense_wave -n 1200 --json out.json
+    python benchmarks/harness.py --compare out.json       # diff against a previous run
+    python benchmarks/harness.py --replay session.rep     # time a recorded session (space_shooter.py --record)
+    python benchmarks/harness.py --cold-start 10 -s idle  # median of 10 cold starts
+
+Every run also reports cold start: fresh interpreters that import the game,
+construct Game (opening the window and loading assets) and present the first
+frame, with the median time of each step.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from replay import InputReplay
+from space_shooter import Asteroid, Enemy, Game, GameState, SCREEN_WIDTH, SCREEN_HEIGHT
+
+PHASES = ("events", "update", "collisions", "snapshot", "draw", "flip")
+PERCENTILES = (50, 95, 99)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in a fresh interpreter; prints how long each startup step took
+COLD_START_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+from space_shooter import Game
+imported = time.perf_counter()
+game = Game(seed=1, display_scaling={display!r})
+created = time.perf_counter()
+game.render()
+game.present()
+shown = time.perf_counter()
+print(json.dumps({{"import": imported - start, "game": created - imported, "first_frame": shown - created}}))
+"""
+COLD_START_STEPS = ("import", "game", "first_frame", "process")
+
+
+class ScriptedKeys:
+    """Stands in for pygame.key.get_pressed() with a fixed set of held keys"""
+    def __init__(self, held=()):
+        self.held = frozenset(held)
+
+    def __getitem__(self, key):
+        return key in self.held
+
+
+NO_KEYS = ScriptedKeys()
+
+
+def strafe(frame, period, left, right):
+    """Hold left for half of every period frames and right for the other half"""
+    return right if (frame // (period // 2)) % 2 else left
+
+
+def idle_script(game, frame):
+    """Nobody touches the controls"""
+    return (), NO_KEYS
+
+
+def normal_script(game, frame):
+    """Both players strafe and fire at a human pace"""
+    presses = []
+    if frame % 15 == 0:
+        presses.append(pygame.K_SPACE)
+    if frame % 15 == 7:
+        presses.append(pygame.K_RETURN)
+    held = (strafe(frame, 120, pygame.K_LEFT, pygame.K_RIGHT), strafe(frame + 60, 90, pygame.K_a, pygame.K_d))
+    return presses, ScriptedKeys(held)
+
+
+def bullet_spam_script(game, frame):
+    """Both players fire every frame while strafing"""
+    held = (strafe(frame, 60, pygame.K_LEFT, pygame.K_RIGHT), strafe(frame, 80, pygame.K_d, pygame.K_a))
+    return (pygame.K_SPACE, pygame.K_RETURN), ScriptedKeys(held)
+
+
+def dense_wave_setup(game, frames):
+    """Hundreds of enemies and asteroids on screen, players invulnerable so the wave persists"""
+    rng = game.rng
+    for _ in range(300):
+        game.enemies.append(Enemy(rng.randint(0, SCREEN_WIDTH - 30), rng.uniform(-25, SCREEN_HEIGHT), rng))
+    for _ in range(200):
+        game.asteroids.append(Asteroid(rng.randint(0, SCREEN_WIDTH - 40), rng.uniform(-40, SCREEN_HEIGHT), rng))
+    game.enemy_spawn_delay = 1
+    game.asteroid_spawn_delay = 1
+    game.invulnerable_timer = frames + 1
+
+
+SCENARIOS = {
+    "idle": (None, idle_script),
+    "normal": (None, normal_script),
+    "bullet_spam": (None, bullet_spam_script),
+    "dense_wave": (dense_wave_setup, bullet_spam_script),
+}
+
+
+def percentile(ordered, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def summarize(samples):
+    """Mean and percentiles (milliseconds) of a list of durations in seconds"""
+    ordered = sorted(samples)
+    summary = {"mean": sum(ordered) * 1000 / len(ordered) if ordered else 0.0}
+    for pct in PERCENTILES:
+        summary[f"p{pct}"] = percentile(ordered, pct) * 1000
+    return summary
+
+
+def run_scenario(name, frames, seed, backend="python", dirty_rects=False, display="native"):
+    """Run one scenario headless and return its timing report"""
+    setup, script = SCENARIOS[name]
+    game = Game(backend=backend, dirty_rects=dirty_rects, seed=seed, display_scaling=display, rewind=True)
+    pygame.event.clear()
+    if setup:
+        setup(game, frames)
+
+    timings = {phase: [] for phase in PHASES}
+    frame_times = []
+    entity_total = 0
+    pushed_total = 0
+    clock = time.perf_counter
+    start = clock()
+    for frame in range(frames):
+        presses, keys = script(game, frame)
+        if game.state == GameState.GAME_OVER:
+            presses = (pygame.K_r,)
+        for key in presses:
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key))
+
+        t0 = clock()
+        game.handle_events()
+        t1 = clock()
+        playing = game.state == GameState.PLAYING
+        if playing:
+            game.move_entities(keys)
+        t2 = clock()
+        if playing:
+            game.check_collisions()
+        t3 = clock()
+        if playing and game.rewind is not None:
+            game.rewind.push(game)
+        t4 = clock()
+        game.render()
+        t5 = clock()
+        game.present()
+        t6 = clock()
+
+        for phase, begin, end in zip(PHASES, (t0, t1, t2, t3, t4, t5), (t1, t2, t3, t4, t5, t6)):
+            timings[phase].append(end - begin)
+        frame_times.append(t6 - t0)
+        pushed_total += game.pushed_bytes
+        entity_total += (len(game.bullets) + len(game.enemy_bullets) + len(game.enemies)
+                         + len(game.asteroids) + len(game.stars))
+    elapsed = clock() - start
+
+    return {
+        "frames": frames,
+        "fps": frames / elapsed,
+        "frame": summarize(frame_times),
+        "phases": {phase: summarize(samples) for phase, samples in timings.items()},
+        "mean_entities": entity_total / frames,
+        "pushed_kib_per_frame": pushed_total / frames / 1024,
+        "final_score": game.score,
+    }
+
+
+def run_replay(path, backend="python", dirty_rects=False, display="native"):
+    """Replay a recorded session uncapped and return its timing report"""
+    recording = InputReplay(path)
+    game = Game(backend=backend, dirty_rects=dirty_rects, seed=recording.seed, display_scaling=display,
+                rewind=recording.rewind_ticks > 0)
+    pygame.event.clear()
+    game.profiler.start_trace()
+    stats = game.replay(recording, fps=0)
+    records = game.profiler.trace
+    frames = max(1, stats["frames"])
+    # The profiler records milliseconds; summarize takes seconds
+    samples = lambda name: [record.get(name, 0.0) / 1000 for record in records]
+    entities = ("bullets_count", "enemy_bullets_count", "enemies_count", "asteroids_count", "stars_count")
+    return {
+        "frames": stats["frames"],
+        "fps": stats["fps"],
+        "frame": summarize(samples("total")),
+        "phases": {phase: summarize(samples(phase)) for phase in PHASES},
+        "mean_entities": sum(record[name] for record in records for name in entities) / frames,
+        "pushed_kib_per_frame": sum(record["pushed_bytes"] for record in records) / frames / 1024,
+        "final_score": stats["score"],
+    }
+
+
+def measure_cold_start(runs, display="native"):
+    """Median milliseconds of each startup step over runs fresh processes"""
+    script = COLD_START_SCRIPT.format(root=ROOT, display=display)
+    samples = {step: [] for step in COLD_START_STEPS}
+    for _ in range(runs):
+        start = time.perf_counter()
+        output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout
+        samples["process"].append(time.perf_counter() - start)  # Includes interpreter startup and exit
+        for step, seconds in json.loads(output.splitlines()[-1]).items():
+            samples[step].append(seconds)
+    return {step: statistics.median(values) * 1000 for step, values in samples.items()}
+
+
+def print_cold_start(report, baseline=None):
+    """Cold start step timings, with ratios against a baseline if given"""
+    print("cold start (median ms)" + ("  vs base" if baseline else ""))
+    for step in COLD_START_STEPS:
+        line = f"  {step:<11}{report[step]:>10.1f}"
+        if baseline and baseline.get(step):
+            line += f"  {report[step] / baseline[step]:>7.2f}x"
+        print(line)
+
+
+def print_report(name, report, baseline=None):
+    """Human-readable table for one scenario, with ratios against a baseline report if given"""
+    header = (f"{name}: {report['fps']:.0f} FPS over {report['frames']} frames, "
+              f"{report['mean_entities']:.0f} entities, {report['pushed_kib_per_frame']:.0f} KiB pushed/frame")
+    if baseline:
+        header += f" (baseline {baseline['fps']:.0f} FPS, {report['fps'] / baseline['fps']:.2f}x)"
+    print(header)
+    print(f"  {'phase':<11}" + "".join(f"{'p' + str(pct) + ' ms':>10}" for pct in PERCENTILES)
+          + ("  p50 vs base" if baseline else ""))
+    rows = list(report["phases"].items()) + [("frame", report["frame"])]
+    for phase, summary in rows:
+        line = f"  {phase:<11}" + "".join(f"{summary[f'p{pct}']:>10.3f}" for pct in PERCENTILES)
+        if baseline:
+            base = baseline["phases"].get(phase, baseline["frame"])["p50"]
+            line += f"  {summary['p50'] / base:>10.2f}x" if base else ""
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless Space Shooter benchmark harness")
+    parser.add_argument("-s", "--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="scenario to run (repeatable; default: all, or none with --replay)")
+    parser.add_argument("-n", "--frames", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--backend", choices=("python", "numpy"), default="python")
+    parser.add_argument("--dirty-rects", action="store_true", help="use dirty-rect rendering")
+    parser.add_argument("--display", choices=("native", "scaled", "integer"), default="native",
+                        help="how frames are scaled to the window (see DISPLAY_SCALING in space_shooter.py)")
+    parser.add_argument("--json", metavar="PATH", help="write the results as JSON ('-' for stdout)")
+    parser.add_argument("--compare", metavar="PATH", help="previous --json output to compare against")
+    parser.add_argument("--replay", metavar="PATH", action="append",
+                        help="also time a recorded session (repeatable; reported under its file name)")
+    parser.add_argument("--cold-start", type=int, default=5, metavar="RUNS",
+                        help="fresh processes to time startup in (0 skips it)")
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    cold_baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+        baseline = previous["scenarios"]
+        cold_baseline = previous.get("cold_start")
+
+    results = {
+        "meta": {
+            "seed": args.seed,
+            "frames": args.frames,
+            "backend": args.backend,
+            "dirty_rects": args.dirty_rects,
+            "display": args.display,
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "scenarios": {},
+    }
+    if args.cold_start:
+        results["cold_start"] = measure_cold_start(args.cold_start, args.display)
+        if args.json != "-":
+            print_cold_start(results["cold_start"], cold_baseline)
+    # Recorded sessions replace the scripted scenarios unless some are asked for too
+    for name in args.scenario or (() if args.replay else SCENARIOS):
+        report = run_scenario(name, args.frames, args.seed, args.backend, args.dirty_rects, args.display)
+        results["scenarios"][name] = report
+        if args.json != "-":
+            print_report(name, report, baseline.get(name))
+    for path in args.replay or ():
+        name = "replay:" + os.path.basename(path)
+        report = run_replay(path, args.backend, args.dirty_rects, args.display)
+        results["scenarios"][name] = report
+        if args.json != "-":
+            print_report(name, report, baseline.get(name))
+
+    if args.json == "-":
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    elif args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+"""Gym-style environment wrappers for training bots against Space Shooter.
+
+ShooterEnv drives one Game through reset()/step(): each step takes an action
+per player, runs one simulation tick through handle_events/update and returns
+(observation, reward, done, info). Observations are either a compact float32
+feature array (both ships plus the nearest enemies, enemy bullets and
+asteroids) or a downsampled RGB frame. Frames are rendered offscreen and
+scaled into a small surface whose pixels are exposed through
+pygame.surfarray, so the returned array is a view of that surface and no
+per-step array is allocated.
+
+VectorEnv steps N environments in lockstep, either in this process or spread
+over worker processes that write observations straight into one shared
+(N, ...) array. It counts steps per second across all environments.
+
+Needs NumPy.
+"""
+import multiprocessing
+import random
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+import pygame
+
+from replay import HELD_KEYS, ReplayKeys
+from space_shooter import Game, GameState, SCREEN_WIDTH, SCREEN_HEIGHT
+
+# Per-player action: move (none, left, right, up, down) plus 5 when firing
+MOVES = 5
+ACTION_COUNT = MOVES * 2
+PLAYER_KEYS = (
+    ((pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN), pygame.K_SPACE),
+    ((pygame.K_a, pygame.K_d, pygame.K_w, pygame.K_s), pygame.K_RETURN),
+)
+
+LIFE_PENALTY = 5.0  # Reward lost per life; each kill is worth 1
+MAX_STEPS = 10 * 60 * 60  # Episodes are cut off after ten simulated minutes
+FEATURE_SLOTS = 8  # Nearest entities of each kind included in feature observations
+FRAME_SIZE = (80, 60)  # Downsampled frame observations, width x height
+
+
+def feature_size():
+    """Length of a feature observation"""
+    # Two ships (x, y), lives and invulnerability, then (present, x, y) per slot of three groups
+    return 6 + 3 * 3 * FEATURE_SLOTS
+
+
+def observation_spec(obs, frame_size=FRAME_SIZE):
+    """(shape, dtype) of one observation"""
+    if obs == "features":
+        return (feature_size(),), np.float32
+    if obs == "pixels":
+        return (frame_size[0], frame_size[1], 3), np.uint8
+    raise ValueError(f"unknown observation type: {obs}")
+
+
+def positions(group):
+    """(x, y) of every entity in a list or vectorized group"""
+    if isinstance(group, list):
+        return [(entity.x, entity.y) for entity in group]
+    return list(zip(group.column("x").tolist(), group.column("y").tolist()))
+
+
+class ShooterEnv:
+    """One game behind a reset()/step() interface"""
+    def __init__(self, obs="features", seed=None, frame_size=FRAME_SIZE, max_steps=MAX_STEPS, backend="python"):
+        self.obs = obs
+        self.shape, self.dtype = observation_spec(obs, frame_size)
+        self.seeds = random.Random(seed)  # Episode seeds, so a seeded env replays the same episodes
+        self.max_steps = max_steps
+        self.backend = backend
+        self.game = None
+        self.steps = 0
+        if obs == "pixels":
+            self.surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+            self.frame = pygame.Surface(frame_size, 0, self.surface)
+            self.frame_view = pygame.surfarray.pixels3d(self.frame)  # Stays locked; frame is only scaled into
+        else:
+            self.features = np.zeros(self.shape, dtype=np.float32)
+
+    def reset(self, seed=None):
+        """Start a new episode and return its first observation"""
+        if seed is None:
+            seed = self.seeds.randrange(2 ** 32)
+        if self.obs == "pixels":
+            self.game = Game(backend=self.backend, seed=seed, screen=self.surface)
+        else:
+            self.game = Game(backend=self.backend, seed=seed, simulate_only=True)
+        self.steps = 0
+        return self.observe()
+
+    def step(self, actions):
+        """Apply one action per player for one tick; return (observation, reward, done, info)"""
+        game = self.game
+        events = []
+        mask = 0
+        for action, (moves, fire) in zip(actions, PLAYER_KEYS):
+            move = action % MOVES
+            if move:
+                mask |= 1 << HELD_KEYS.index(moves[move - 1])
+            if action >= MOVES:
+                events.append(pygame.event.Event(pygame.KEYDOWN, key=fire))
+        score, lives = game.score, game.lives
+        game.handle_events(events)
+        game.update(ReplayKeys(mask))
+        self.steps += 1
+        reward = (game.score - score) / 10 - LIFE_PENALTY * (lives - game.lives)
+        done = game.state == GameState.GAME_OVER or self.steps >= self.max_steps
+        info = {"score": game.score, "lives": game.lives, "steps": self.steps}
+        return self.observe(), reward, done, info
+
+    def observe(self, out=None):
+        """Current observation, written into out when given.
+
+        Pixel observations are a view of the env's frame surface and are
+        overwritten by the next step; copy them to keep them.
+        """
+        if self.obs == "pixels":
+            self.game.render()
+            pygame.transform.scale(self.surface, self.frame.get_size(), self.frame)
+            if out is None:
+                return self.frame_view
+            out[...] = self.frame_view
+            return out
+        features = self.features if out is None else out
+        self.write_features(features)
+        return features
+
+    def write_features(self, features):
+        """Fill a feature observation, coordinates scaled to 0..1"""
+        game = self.game
+        features[:] = 0
+        for i, player in enumerate((game.player1, game.player2)):
+            features[2 * i] = player.x / SCREEN_WIDTH
+            features[2 * i + 1] = player.y / SCREEN_HEIGHT
+        features[4] = game.lives / 3
+        features[5] = game.invulnerable_timer > 0
+        offset = 6
+        for group in (game.enemies, game.enemy_bullets, game.asteroids):
+            # The lowest entities are the closest to the ships
+            nearest = sorted(positions(group), key=lambda position: -position[1])[:FEATURE_SLOTS]
+            for x, y in nearest:
+                features[offset:offset + 3] = (1.0, x / SCREEN_WIDTH, y / SCREEN_HEIGHT)
+                offset += 3
+            offset += 3 * (FEATURE_SLOTS - len(nearest))
+
+    def close(self):
+        """Release the frame surface lock"""
+        self.frame_view = None
+
+
+def step_envs(envs, observations, actions, rewards, dones, infos):
+    """Step each env in place, resetting finished ones; observations[i] gets env i's observation"""
+    for i, env in enumerate(envs):
+        _, reward, done, info = env.step(actions[i])
+        rewards[i] = reward
+        dones[i] = done
+        if done:
+            info["final_score"] = info["score"]
+            env.reset()
+        env.observe(observations[i])
+        infos[i] = info
+
+
+def worker(connection, memory_name, n, start, count, shape, dtype, kwargs, seed):
+    """Worker process loop: owns envs start..start+count and writes their rows of the shared array"""
+    memory = shared_memory.SharedMemory(name=memory_name)
+    observations = np.ndarray((n,) + shape, dtype=dtype, buffer=memory.buf)[start:start + count]
+    envs = [ShooterEnv(seed=seed + start + i, **kwargs) for i in range(count)]
+    rewards = np.zeros(count)
+    dones = np.zeros(count, dtype=bool)
+    infos = [None] * count
+    try:
+        while True:
+            command, actions = connection.recv()
+            if command == "reset":
+                for env, row in zip(envs, observations):
+                    env.reset()
+                    env.observe(row)
+                connection.send(None)
+            elif command == "step":
+                step_envs(envs, observations, actions, rewards, dones, infos)
+                connection.send((rewards, dones, infos))
+            else:
+                break
+    finally:
+        del observations
+        for env in envs:
+            env.close()
+        memory.close()
+
+
+class VectorEnv:
+    """N environments stepped in lockstep, in process (workers=0) or across worker processes"""
+    def __init__(self, n, workers=0, seed=0, **kwargs):
+        self.n = n
+        self.shape, self.dtype = observation_spec(kwargs.get("obs", "features"), kwargs.get("frame_size", FRAME_SIZE))
+        self.steps = 0
+        self.elapsed = 0.0
+        self.rewards = np.zeros(n)
+        self.dones = np.zeros(n, dtype=bool)
+        self.infos = [None] * n
+        self.connections = []
+        self.processes = []
+        self.memory = None
+        workers = min(workers, n)
+        if not workers:
+            self.envs = [ShooterEnv(seed=seed + i, **kwargs) for i in range(n)]
+            self.observations = np.zeros((n,) + self.shape, dtype=self.dtype)
+            return
+        # Workers write observations into one shared array, so only rewards and flags are pickled
+        nbytes = n * int(np.prod(self.shape)) * np.dtype(self.dtype).itemsize
+        self.memory = shared_memory.SharedMemory(create=True, size=nbytes)
+        self.observations = np.ndarray((n,) + self.shape, dtype=self.dtype, buffer=self.memory.buf)
+        context = multiprocessing.get_context("spawn")  # SDL state must not be forked
+        self.slices = []
+        for w in range(workers):
+            start, end = n * w // workers, n * (w + 1) // workers
+            parent, child = context.Pipe()
+            process = context.Process(target=worker, daemon=True,
+                                      args=(child, self.memory.name, n, start, end - start,
+                                            self.shape, self.dtype, kwargs, seed))
+            process.start()
+            self.connections.append(parent)
+            self.processes.append(process)
+            self.slices.append((start, end))
+
+    def reset(self):
+        """Reset every environment; return the (N, ...) observation array"""
+        if self.connections:
+            for connection in self.connections:
+                connection.send(("reset", None))
+            for connection in self.connections:
+                connection.recv()
+        else:
+            for env, row in zip(self.envs, self.observations):
+                env.reset()
+                env.observe(row)
+        return self.observations
+
+    def step(self, actions):
+        """Step every environment with actions[i] = (player 1, player 2); finished ones reset.
+
+        Returns (observations, rewards, dones, infos); the arrays are reused by the next step.
+        """
+        start = time.perf_counter()
+        if self.connections:
+            for connection, (first, last) in zip(self.connections, self.slices):
+                connection.send(("step", actions[first:last]))
+            for connection, (first, last) in zip(self.connections, self.slices):
+                rewards, dones, infos = connection.recv()
+                self.rewards[first:last] = rewards
+                self.dones[first:last] = dones
+                self.infos[first:last] = infos
+        else:
+            step_envs(self.envs, self.observations, actions, self.rewards, self.dones, self.infos)
+        self.elapsed += time.perf_counter() - start
+        self.steps += self.n
+        return self.observations, self.rewards, self.dones, self.infos
+
+    def steps_per_second(self):
+        """Environment steps per second of step() time, summed over all environments"""
+        return self.steps / self.elapsed if self.elapsed else 0.0
+
+    def close(self):
+        """Stop the workers and free the shared observation array"""
+        for connection in self.connections:
+            connection.send(("close", None))
+        for process in self.processes:
+            process.join()
+        self.connections = []
+        self.processes = []
+        if self.memory is not None:
+            self.observations = None
+            self.memory.close()
+            self.memory.unlink()
+            self.memory = None
+        for env in getattr(self, "envs", ()):
+            env.close()
@@ -0,0 +1,494 @@
+"""Networked two-player mode: an authoritative server and interpolating clients over UDP.
+
+The server owns the only simulating Game and runs Game.update at SIM_RATE on
+an asyncio loop. Each client controls one ship: it sends its held movement
+keys, a running count of fire presses and the newest state tick it has
+decoded, once per frame. Resending the full input every frame means a lost
+packet costs nothing but a frame of delay.
+
+Every tick, the server sends each client the game state: a small header,
+then the fields of bullets, enemy bullets, enemies and asteroids, packed as
+in Game.snapshot (positions as float32, integer fields as int32).
+The state is XORed against the newest tick the client acknowledged, and the
+result is zlib-compressed. Unchanged bytes become zeros and nearly vanish.
+If the baseline has left the server's history, the full state is sent
+instead.
+
+Clients render INTERP_TICKS behind the newest state they hold. Each state
+carries the previous positions too, so Game.render(alpha) interpolates
+enemies, bullets and asteroids smoothly between ticks. A lost state holds
+the last one for a frame. Stars are decorative, so each client scrolls its
+own. Clients run no particle effects.
+
+Each side can wrap its socket in a LossyLink, which delays, jitters and
+drops outgoing datagrams, so bad networks can be tested on localhost.
+Clients measure their received bandwidth and their input latency: the time
+from sending an input to receiving the first state that includes it.
+
+Run with:
+    python netplay.py server [--port 50007] [--seed 1]
+    python netplay.py client [--host 127.0.0.1] [--bot]
+    python netplay.py local --latency 50 --jitter 10 --loss 2   # server, your client and a bot in one process
+"""
+import argparse
+import asyncio
+import math
+import random
+import struct
+import time
+import zlib
+
+import pygame
+
+from balance import steer
+from replay import HELD_KEYS, ReplayKeys
+from space_shooter import (Game, GameState, FPS, MAX_FRAME_TIME, SIM_DT, SIM_RATE, Asteroid, Bullet, Enemy,
+                           EnemyBullet, entity_record, load_entities, pack_entities)
+
+NET_PORT = 50007
+INTERP_TICKS = 3  # How far clients render behind the newest state, to ride out jitter and loss
+HISTORY_TICKS = 2 * SIM_RATE  # States kept as delta baselines, on both sides
+CLIENT_TIMEOUT = 5.0  # Seconds of silence before the server frees a client's ship
+MAX_FIRES_PER_TICK = 4  # Shots one input packet can queue at once
+CLOCK_CORRECTION = 0.05  # Share of the render clock's drift from its target removed per frame
+
+# Packets: a type byte, then (input) sequence, acked tick, held bits, fire count
+# or (state) ship, tick, baseline tick, last input applied, state length, compressed state
+INPUT, STATE = 1, 2
+INPUT_PACKET = struct.Struct("<BIIBB")
+STATE_PACKET = struct.Struct("<BBIIIH")
+NO_BASELINE = 0xFFFFFFFF
+
+# Input bits: left, right, up, down, then restart (pressing R on the game over screen)
+MOVE_BITS = 4
+RESTART_BIT = 1 << MOVE_BITS
+# Per ship: the keys its movement bits drive on the server, and its fire key
+SHIP_KEYS = {
+    1: ((pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN), pygame.K_SPACE),
+    2: ((pygame.K_a, pygame.K_d, pygame.K_w, pygame.K_s), pygame.K_RETURN),
+}
+
+# State layout: game state, score, lives, invulnerability, both ships' current and
+# previous positions, then the entity counts of the four gameplay groups
+STATE_HEADER = struct.Struct("<Bqii8f4H")
+
+
+def state_groups(game):
+    """(group, entity class, pool) of every group sent to clients; stars stay local"""
+    return ((game.bullets, Bullet, game.bullet_pool), (game.enemy_bullets, EnemyBullet, game.enemy_bullet_pool),
+            (game.enemies, Enemy, None), (game.asteroids, Asteroid, None))
+
+
+def pack_state(game):
+    """What clients need to draw a frame, as compact bytes (entity fields packed as in snapshots)"""
+    p1, p2 = game.player1, game.player2
+    groups = state_groups(game)
+    parts = [STATE_HEADER.pack(game.state.value, game.score, game.lives, game.invulnerable_timer,
+                               p1.x, p1.y, p1.prev_x, p1.prev_y, p2.x, p2.y, p2.prev_x, p2.prev_y,
+                               *(len(group) for group, _, _ in groups))]
+    parts.extend(pack_entities(group, kind) for group, kind, _ in groups)
+    return b"".join(parts)
+
+
+def apply_state(game, data):
+    """Load a pack_state() state into a client's game"""
+    values = STATE_HEADER.unpack_from(data)
+    game.state = GameState(values[0])
+    game.score, game.lives, game.invulnerable_timer = values[1:4]
+    for player, offset in ((game.player1, 4), (game.player2, 8)):
+        player.x, player.y, player.prev_x, player.prev_y = values[offset:offset + 4]
+    offset = STATE_HEADER.size
+    for (group, kind, pool), count in zip(state_groups(game), values[12:]):
+        size = count * entity_record(kind).size
+        load_entities(group, kind, data[offset:offset + size], count, pool)
+        offset += size
+
+
+def xor_bytes(data, baseline):
+    """data XOR baseline, the shorter one padded with zeros"""
+    size = max(len(data), len(baseline))
+    return (int.from_bytes(data, "little") ^ int.from_bytes(baseline, "little")).to_bytes(size, "little")
+
+
+def encode_state(state, baseline=None):
+    """Compressed state, as a delta against baseline when given"""
+    return zlib.compress(state if baseline is None else xor_bytes(state, baseline))
+
+
+def decode_state(payload, size, baseline=None):
+    """Inverse of encode_state; size is the state's length"""
+    data = zlib.decompress(payload)
+    return data if baseline is None else xor_bytes(data, baseline)[:size]
+
+
+def percentile(samples, pct):
+    """pct-th percentile of samples (nearest rank), 0.0 when empty"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class LossyLink:
+    """Wraps a datagram transport, delaying, jittering and dropping what it sends"""
+    def __init__(self, transport, latency_ms=0.0, jitter_ms=0.0, loss=0.0, seed=None):
+        self.transport = transport
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.loss = loss
+        self.rng = random.Random(seed)
+        self.loop = asyncio.get_running_loop()
+        self.dropped = 0
+
+    def sendto(self, data, addr=None):
+        """Send data after the simulated one-way delay, unless it is lost"""
+        if self.rng.random() < self.loss:
+            self.dropped += 1
+            return
+        delay = self.latency + self.rng.uniform(-self.jitter, self.jitter)
+        if delay <= 0:
+            self.deliver(data, addr)
+        else:
+            self.loop.call_later(delay, self.deliver, data, addr)
+
+    def deliver(self, data, addr):
+        """Hand data to the socket, unless it was closed while the datagram was in flight"""
+        if not self.transport.is_closing():
+            self.transport.sendto(data, addr)
+
+
+class RemotePlayer:
+    """Server-side record of one connected client"""
+    def __init__(self, addr, ship):
+        self.addr = addr
+        self.ship = ship
+        self.sequence = 0  # Newest input sequence received
+        self.held = 0
+        self.fires = None  # Client's running fire count as last seen
+        self.pending_fires = 0
+        self.ack = NO_BASELINE
+        self.last_heard = time.perf_counter()
+        self.sent_bytes = 0
+        self.sent_states = 0
+        self.full_states = 0
+
+
+class GameServer(asyncio.DatagramProtocol):
+    """Authoritative simulation for up to two remote players"""
+    def __init__(self, seed=None, link=None):
+        self.game = Game(seed=seed, simulate_only=True)
+        self.link = link or {}  # LossyLink settings for outgoing datagrams
+        self.players = {}
+        self.tick = 0
+        self.history = {}
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = LossyLink(transport, **self.link)
+
+    def datagram_received(self, data, addr):
+        if len(data) != INPUT_PACKET.size or data[0] != INPUT:
+            return
+        _, sequence, ack, held, fires = INPUT_PACKET.unpack(data)
+        player = self.players.get(addr)
+        if player is None:
+            free = [ship for ship in SHIP_KEYS if ship not in {p.ship for p in self.players.values()}]
+            if not free:
+                return  # Both ships taken
+            player = self.players[addr] = RemotePlayer(addr, free[0])
+        player.last_heard = time.perf_counter()
+        if sequence <= player.sequence:
+            return  # Reordered; a newer input already arrived
+        player.sequence = sequence
+        player.held = held
+        if player.fires is not None:
+            player.pending_fires = min(MAX_FIRES_PER_TICK, player.pending_fires + (fires - player.fires) % 256)
+        player.fires = fires
+        if ack != NO_BASELINE and (player.ack == NO_BASELINE or ack > player.ack):
+            player.ack = ack
+
+    def step(self):
+        """Run one simulation tick on the players' latest input and send everyone the new state"""
+        game = self.game
+        now = time.perf_counter()
+        for addr in [addr for addr, p in self.players.items() if now - p.last_heard > CLIENT_TIMEOUT]:
+            del self.players[addr]
+        mask = 0
+        events = []
+        for player in self.players.values():
+            moves, fire = SHIP_KEYS[player.ship]
+            for bit, key in enumerate(moves):
+                if player.held >> bit & 1:
+                    mask |= 1 << HELD_KEYS.index(key)
+            events.extend(pygame.event.Event(pygame.KEYDOWN, key=fire) for _ in range(player.pending_fires))
+            player.pending_fires = 0
+            if player.held & RESTART_BIT:
+                events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_r))
+        game.handle_events(events)
+        game.update(ReplayKeys(mask))
+        self.tick += 1
+        state = self.history[self.tick] = pack_state(game)
+        self.history.pop(self.tick - HISTORY_TICKS, None)
+        for player in self.players.values():
+            baseline = self.history.get(player.ack)
+            if baseline is None:
+                player.full_states += 1
+            packet = STATE_PACKET.pack(STATE, player.ship, self.tick,
+                                       NO_BASELINE if baseline is None else player.ack,
+                                       player.sequence, len(state)) + encode_state(state, baseline)
+            self.transport.sendto(packet, player.addr)
+            player.sent_bytes += len(packet)
+            player.sent_states += 1
+
+    async def serve(self, duration=None):
+        """Tick at SIM_RATE while anyone is connected, for duration seconds (forever when None)"""
+        loop = asyncio.get_running_loop()
+        start = next_tick = loop.time()
+        while duration is None or loop.time() - start < duration:
+            if self.players:
+                self.step()
+            next_tick += SIM_DT
+            delay = next_tick - loop.time()
+            if delay < -MAX_FRAME_TIME:
+                next_tick = loop.time()  # Fell far behind; skip ahead rather than burst
+            await asyncio.sleep(max(0.0, delay))
+
+    def stats(self):
+        """Per ship: states and bytes sent, and how many were full rather than deltas"""
+        return {player.ship: {"states": player.sent_states, "bytes": player.sent_bytes,
+                              "full_states": player.full_states} for player in self.players.values()}
+
+
+class GameClient(asyncio.DatagramProtocol):
+    """Sends one ship's input and draws the server's states, interpolated.
+
+    controller(client) returns (held bits, fired this frame); by default the
+    keyboard (arrows or WASD, Space or Enter to fire, R to restart).
+    Without a screen the client decodes and applies states but draws nothing.
+    """
+    def __init__(self, render=True, controller=None, link=None, display_scaling=None):
+        self.render = render
+        if render:
+            kwargs = {} if display_scaling is None else {"display_scaling": display_scaling}
+            self.game = Game(**kwargs)
+        else:
+            self.game = Game(simulate_only=True)
+        self.controller = controller or keyboard_controller
+        self.keydowns = []  # Keys pressed this frame, for the keyboard controller
+        self.link = link or {}
+        self.transport = None
+        self.ship = None
+        self.sequence = 0
+        self.fires = 0
+        self.states = {}
+        self.newest = None
+        self.applied = None
+        self.render_tick = None
+        self.sent_at = {}
+        self.applied_input = 0
+        self.latencies = []
+        self.received_bytes = 0
+        self.received_states = 0
+        self.undecodable = 0
+        self.elapsed = 0.0
+        self.closed = False
+
+    def connection_made(self, transport):
+        self.transport = LossyLink(transport, **self.link)
+
+    def datagram_received(self, data, addr):
+        if len(data) < STATE_PACKET.size or data[0] != STATE:
+            return
+        _, self.ship, tick, baseline_tick, applied_input, size = STATE_PACKET.unpack_from(data)
+        self.received_bytes += len(data)
+        self.received_states += 1
+        if applied_input > self.applied_input:
+            # First state to include this input: one input-to-state latency sample
+            sent = self.sent_at.pop(applied_input, None)
+            if sent is not None:
+                self.latencies.append((time.perf_counter() - sent) * 1000)
+            self.applied_input = applied_input
+        if tick in self.states:
+            return
+        if baseline_tick == NO_BASELINE:
+            baseline = None
+        else:
+            baseline = self.states.get(baseline_tick)
+            if baseline is None:
+                self.undecodable += 1  # Baseline already dropped here; a later state will do
+                return
+        self.states[tick] = decode_state(data[STATE_PACKET.size:], size, baseline)
+        if self.newest is None or tick > self.newest:
+            self.newest = tick
+            for old in [old for old in self.states if old <= tick - HISTORY_TICKS]:
+                del self.states[old]
+
+    def connection_lost(self, exc):
+        self.closed = True
+
+    def send_input(self):
+        """Send this frame's held keys, fire count and newest decoded tick"""
+        held, fired = self.controller(self)
+        if fired:
+            self.fires = (self.fires + 1) % 256
+        self.sequence += 1
+        self.sent_at[self.sequence] = time.perf_counter()
+        self.sent_at.pop(self.sequence - HISTORY_TICKS, None)
+        ack = NO_BASELINE if self.newest is None else self.newest
+        self.transport.sendto(INPUT_PACKET.pack(INPUT, self.sequence, ack, held, self.fires))
+
+    def advance(self, seconds):
+        """Move the render clock; return (state tick to show, interpolation alpha) or None"""
+        if self.newest is None:
+            return None
+        target = self.newest - INTERP_TICKS
+        previous = self.render_tick
+        if previous is None or abs(target - previous) > SIM_RATE / 2:
+            self.render_tick = float(target)  # First state, or a long stall: jump
+        else:
+            self.render_tick += seconds * SIM_RATE + (target - previous) * CLOCK_CORRECTION
+        if previous is not None and self.render:
+            for _ in range(min(INTERP_TICKS * 2, int(self.render_tick) - int(previous))):
+                self.game.update_stars()
+        tick = math.ceil(self.render_tick)
+        alpha = 1.0 - (tick - self.render_tick)
+        for shown in range(tick, tick - HISTORY_TICKS, -1):
+            if shown in self.states:
+                # A missing state holds the newest earlier one, fully arrived
+                return shown, alpha if shown == tick else 1.0
+        return None
+
+    def frame(self, seconds):
+        """Send input, then apply and draw the state due at this moment"""
+        self.send_input()
+        due = self.advance(seconds)
+        if due is None:
+            return
+        tick, alpha = due
+        if tick != self.applied:
+            apply_state(self.game, self.states[tick])
+            self.applied = tick
+        if self.render:
+            self.game.render(alpha)
+            self.game.present()
+
+    async def play(self, fps=FPS, duration=None):
+        """Client loop at fps frames per second until the window closes or duration seconds pass"""
+        loop = asyncio.get_running_loop()
+        start = previous = loop.time()
+        while not self.closed and (duration is None or loop.time() - start < duration):
+            if self.render:
+                events = pygame.event.get()
+                if any(event.type == pygame.QUIT for event in events):
+                    break
+                self.keydowns = [event.key for event in events if event.type == pygame.KEYDOWN]
+            now = loop.time()
+            self.frame(now - previous)
+            previous = now
+            await asyncio.sleep(max(0.0, 1 / fps - (loop.time() - now)))
+        self.elapsed = loop.time() - start
+
+    def stats(self):
+        """Received bandwidth, state counts and input latency of this client"""
+        elapsed = self.elapsed or 1.0
+        return {"ship": self.ship, "states": self.received_states, "undecodable": self.undecodable,
+                "kib_per_s": self.received_bytes / elapsed / 1024,
+                "mean_state_bytes": self.received_bytes / self.received_states if self.received_states else 0.0,
+                "latency_p50_ms": percentile(self.latencies, 50), "latency_p95_ms": percentile(self.latencies, 95),
+                "interp_ms": INTERP_TICKS * SIM_DT * 1000}
+
+
+def keyboard_controller(client):
+    """Held bits and fire press from the local keyboard; either control scheme drives the ship"""
+    # At most one shot per frame; two presses within 1/60 s are rare
+    fired = pygame.K_SPACE in client.keydowns or pygame.K_RETURN in client.keydowns
+    keys = pygame.key.get_pressed()
+    held = 0
+    for bit, (arrow, letter) in enumerate(zip(SHIP_KEYS[1][0], SHIP_KEYS[2][0])):
+        if keys[arrow] or keys[letter]:
+            held |= 1 << bit
+    if keys[pygame.K_r]:
+        held |= RESTART_BIT
+    return held, fired
+
+
+def bot_controller(client, fire_interval=8):
+    """Held bits and fire press from the balance-sweep AI, steering the client's ship"""
+    game = client.game
+    held = RESTART_BIT
+    if client.ship is not None:
+        player = game.player1 if client.ship == 1 else game.player2
+        direction = steer(player, game)
+        held |= 1 if direction < 0 else 2 if direction > 0 else 0
+    return held, client.sequence % fire_interval == 0
+
+
+async def start_server(host="127.0.0.1", port=NET_PORT, seed=None, link=None):
+    """Bind a GameServer; returns (server, transport)"""
+    loop = asyncio.get_running_loop()
+    transport, server = await loop.create_datagram_endpoint(lambda: GameServer(seed, link),
+                                                            local_addr=(host, port))
+    return server, transport
+
+
+async def start_client(host="127.0.0.1", port=NET_PORT, **kwargs):
+    """Connect a GameClient to a server; returns (client, transport)"""
+    loop = asyncio.get_running_loop()
+    transport, client = await loop.create_datagram_endpoint(lambda: GameClient(**kwargs),
+                                                            remote_addr=(host, port))
+    return client, transport
+
+
+def print_stats(client):
+    """One line of client statistics"""
+    stats = client.stats()
+    print(f"ship {stats['ship']}: {stats['kib_per_s']:.1f} KiB/s, {stats['mean_state_bytes']:.0f} B/state, "
+          f"input latency p50 {stats['latency_p50_ms']:.0f} ms / p95 {stats['latency_p95_ms']:.0f} ms "
+          f"(+{stats['interp_ms']:.0f} ms interpolation), {stats['undecodable']} undecodable")
+
+
+async def main(argv=None):
+    parser = argparse.ArgumentParser(description="Networked two-player Space Shooter")
+    parser.add_argument("mode", choices=("server", "client", "local"),
+                        help="local runs the server, a windowed client and a bot client in one process")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=NET_PORT)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--bot", action="store_true", help="client: let the AI fly the ship")
+    parser.add_argument("--latency", type=float, default=0.0, metavar="MS", help="simulated one-way delay")
+    parser.add_argument("--jitter", type=float, default=0.0, metavar="MS", help="random extra delay, +-MS")
+    parser.add_argument("--loss", type=float, default=0.0, metavar="PCT", help="simulated packet loss")
+    args = parser.parse_args(argv)
+    link = {"latency_ms": args.latency, "jitter_ms": args.jitter, "loss": args.loss / 100}
+
+    transports = []
+    try:
+        if args.mode in ("server", "local"):
+            server, transport = await start_server(args.host, args.port, args.seed, link)
+            transports.append(transport)
+            if args.mode == "server":
+                print(f"serving on {args.host}:{args.port}")
+                await server.serve()
+                return
+            serving = asyncio.ensure_future(server.serve())
+            bot, transport = await start_client(args.host, args.port, render=False,
+                                                controller=bot_controller, link=link)
+            transports.append(transport)
+            botting = asyncio.ensure_future(bot.play())
+        controller = bot_controller if args.bot else None
+        client, transport = await start_client(args.host, args.port, controller=controller, link=link)
+        transports.append(transport)
+        await client.play()
+        print_stats(client)
+        if args.mode == "local":
+            serving.cancel()
+            botting.cancel()
+            print_stats(bot)
+    finally:
+        for transport in transports:
+            transport.close()
+        pygame.quit()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
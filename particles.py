@@ -0,0 +1,129 @@
+"""Array-backed particle system for explosions, debris and engine trails.
+
+Particles live in preallocated NumPy arrays (position, velocity, lifetime,
+colour) capped at a fixed capacity. Each tick advances every particle with one
+vectorized step and drops the dead ones with a single boolean-mask compaction.
+Drawing writes all particles straight into the target surface's pixels through
+pygame.surfarray, so ten thousand particles cost a handful of array operations
+rather than one Python call each. Particles use their own random generator and
+never touch the game's random state, so effects cannot change gameplay.
+"""
+import numpy as np
+import pygame
+
+PARTICLE_CAPACITY = 10000  # Hard cap; emissions beyond it are dropped
+PARTICLE_SIZE = 2  # Square particle size in pixels
+PARTICLE_DRAG = 0.96  # Velocity kept per tick
+PARTICLE_GRAVITY = 0.03  # Pixels per tick squared, pulling debris down the screen
+
+
+class ParticleSystem:
+    """Fixed-capacity particle arrays with vectorized update and drawing"""
+    def __init__(self, width, height, capacity=PARTICLE_CAPACITY, seed=None):
+        self.width = width
+        self.height = height
+        self.capacity = capacity
+        self.count = 0
+        self.dropped = 0  # Particles refused because the cap was reached
+        self.rng = np.random.default_rng(seed)
+        self.pos = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.life = np.zeros(capacity)
+        self.max_life = np.ones(capacity)
+        self.color = np.zeros((capacity, 3))
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        """Remove every particle"""
+        self.count = 0
+
+    def emit(self, x, y, count, color, speed=(1.0, 4.0), life=(20, 45), direction=None, spread=np.pi):
+        """Spawn up to count particles at (x, y) moving outwards.
+
+        direction is the mean heading in radians (None for a full circle) and
+        spread the half-angle around it.
+        """
+        available = self.capacity - self.count
+        if count > available:
+            self.dropped += count - available
+            count = available
+        if count <= 0:
+            return
+        rng = self.rng
+        start, end = self.count, self.count + count
+        if direction is None:
+            angle = rng.uniform(0, 2 * np.pi, count)
+        else:
+            angle = direction + rng.uniform(-spread, spread, count)
+        magnitude = rng.uniform(speed[0], speed[1], count)
+        self.pos[start:end] = (x, y)
+        self.vel[start:end, 0] = np.cos(angle) * magnitude
+        self.vel[start:end, 1] = np.sin(angle) * magnitude
+        lifetime = rng.uniform(life[0], life[1], count)
+        self.life[start:end] = lifetime
+        self.max_life[start:end] = lifetime
+        # Vary the colour slightly per particle
+        self.color[start:end] = np.clip(np.asarray(color, dtype=float) * rng.uniform(0.7, 1.1, (count, 1)), 0, 255)
+        self.count = end
+
+    def update(self):
+        """Advance every particle one tick and cull the dead and off-screen ones"""
+        n = self.count
+        if not n:
+            return
+        pos, vel = self.pos[:n], self.vel[:n]
+        pos += vel
+        vel *= PARTICLE_DRAG
+        vel[:, 1] += PARTICLE_GRAVITY
+        self.life[:n] -= 1
+        keep = ((self.life[:n] > 0) & (pos[:, 0] >= 0) & (pos[:, 0] < self.width)
+                & (pos[:, 1] >= 0) & (pos[:, 1] < self.height))
+        kept = int(np.count_nonzero(keep))
+        if kept != n:
+            for array in (self.pos, self.vel, self.life, self.max_life, self.color):
+                array[:kept] = array[:n][keep]
+            self.count = kept
+
+    def draw(self, screen, alpha=1.0, dirty=None):
+        """Write every particle into screen's pixels, fading with age.
+
+        alpha interpolates back towards the previous tick's positions. When
+        dirty is a list, the bounding rect of all particles is appended to it.
+        A surface smaller than the play area (reduced-resolution rendering)
+        gets positions scaled to fit.
+        """
+        n = self.count
+        if not n:
+            return
+        pos = self.pos[:n] - self.vel[:n] * (1.0 - alpha)
+        width, height = screen.get_size()
+        if width != self.width:
+            pos *= width / self.width
+        x = pos[:, 0].astype(np.int64)
+        y = pos[:, 1].astype(np.int64)
+        fade = (self.life[:n] / self.max_life[:n])[:, None]
+        rgb = (self.color[:n] * fade).astype(np.int64)
+
+        if screen.get_bytesize() != 4:
+            # surfarray.pixels2d needs 32-bit pixels; fall back to one fill per particle
+            for px, py, color in zip(x.tolist(), y.tolist(), rgb.tolist()):
+                screen.fill(color, (px, py, PARTICLE_SIZE, PARTICLE_SIZE))
+        else:
+            shifts, losses = screen.get_shifts(), screen.get_losses()
+            mapped = screen.get_masks()[3]  # Opaque alpha, if the format has it
+            for channel in range(3):
+                mapped = mapped | ((rgb[:, channel] >> losses[channel]) << shifts[channel])
+            pixels = pygame.surfarray.pixels2d(screen)
+            for dx in range(PARTICLE_SIZE):
+                for dy in range(PARTICLE_SIZE):
+                    px, py = x + dx, y + dy
+                    inside = (px >= 0) & (px < width) & (py >= 0) & (py < height)
+                    pixels[px[inside], py[inside]] = mapped[inside]
+            del pixels  # Unlock the surface
+
+        if dirty is not None:
+            left, top = int(x.min()), int(y.min())
+            dirty.append(pygame.Rect(left, top, int(x.max()) - left + PARTICLE_SIZE,
+                                     int(y.max()) - top + PARTICLE_SIZE).clip(screen.get_rect()))
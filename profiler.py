@@ -0,0 +1,150 @@
+"""Frame profiler and on-screen performance overlay for Space Shooter.
+
+Game calls clock()/lap() around each phase of the main loop and around every
+entity group's update and draw. While the profiler is disabled both calls
+return immediately, so the hooks cost a couple of method calls per section.
+When enabled, each frame's section timings and entity counts go into a
+rolling ring buffer (and optionally a full trace for writing to CSV/JSON).
+"""
+import csv
+import json
+import time
+from collections import deque
+
+import pygame
+
+PROFILE_HISTORY = 240  # Frames kept in the ring buffer (and drawn in the graph)
+FRAME_BUDGET_MS = 1000 / 60
+PHASES = ("events", "update", "collisions", "snapshot", "draw", "flip")
+
+
+class FrameProfiler:
+    """Collects per-frame section timings and entity counts"""
+    def __init__(self, capacity=PROFILE_HISTORY):
+        self.enabled = False
+        self.overlay = False
+        self.frames = deque(maxlen=capacity)
+        self.trace = None  # Every frame record, when a trace file was requested
+        self.current = {}
+        self.frame_start = 0.0
+        self.frame_index = 0
+        self.font = None
+
+    def set_overlay(self, visible):
+        """Show or hide the overlay; recording runs while it is shown or a trace is active"""
+        self.overlay = visible
+        self.enabled = visible or self.trace is not None
+
+    def start_trace(self):
+        """Keep every frame record (not just the ring buffer) for write_trace"""
+        self.trace = []
+        self.enabled = True
+
+    def clock(self):
+        """Start time for a section, or 0.0 when disabled"""
+        return time.perf_counter() if self.enabled else 0.0
+
+    def lap(self, name, start):
+        """Add the time since start to section name and return now (for chaining sections)"""
+        if not self.enabled:
+            return 0.0
+        now = time.perf_counter()
+        self.current[name] = self.current.get(name, 0.0) + (now - start) * 1000
+        return now
+
+    def begin_frame(self):
+        """Start a new frame record"""
+        if self.enabled:
+            now = time.perf_counter()
+            # Wall time since the previous frame started, including any frame-cap wait
+            self.current = {"period": (now - self.frame_start) * 1000 if self.frames else 0.0}
+            self.frame_start = now
+
+    def end_frame(self, counts):
+        """Close the frame record with its total time and entity counts"""
+        if not self.enabled:
+            return
+        record = self.current
+        record["frame"] = self.frame_index
+        record["total"] = (time.perf_counter() - self.frame_start) * 1000
+        record.update(counts)
+        self.frame_index += 1
+        self.frames.append(record)
+        if self.trace is not None:
+            self.trace.append(record)
+
+    def summary(self, name="total"):
+        """Mean, p50, p95 and max of one section over the ring buffer (milliseconds)"""
+        samples = sorted(record.get(name, 0.0) for record in self.frames)
+        if not samples:
+            return {"mean": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+        return {
+            "mean": sum(samples) / len(samples),
+            "p50": samples[len(samples) // 2],
+            "p95": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+            "max": samples[-1],
+        }
+
+    def write_trace(self, path):
+        """Write the recorded trace as JSON (.json) or CSV (anything else)"""
+        records = self.trace if self.trace is not None else list(self.frames)
+        if path.endswith(".json"):
+            with open(path, "w") as f:
+                json.dump(records, f)
+            return
+        columns = []
+        for record in records:
+            for key in record:
+                if key not in columns:
+                    columns.append(key)
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=columns, restval=0)
+            writer.writeheader()
+            writer.writerows(records)
+
+    def draw_overlay(self, screen, extra_lines=()):
+        """Draw the frame-time graph and counters in the top-right corner; return the panel rect"""
+        if self.font is None:
+            self.font = pygame.font.Font(None, 18)
+        width, height = self.frames.maxlen, 60
+        left = screen.get_width() - width - 10
+        top = 10
+        panel = pygame.Rect(left - 4, top - 4, width + 8, height + 8 + 14 * (5 + len(PHASES) + len(extra_lines)))
+        screen.fill((20, 20, 30), panel)
+
+        # Frame-time bars, stacked by phase, against the 60 FPS budget line
+        scale = height / (FRAME_BUDGET_MS * 2)
+        colors = {"update": (80, 160, 255), "collisions": (255, 160, 0), "snapshot": (240, 220, 80),
+                  "draw": (80, 220, 120), "flip": (200, 80, 200)}
+        for i, record in enumerate(self.frames):
+            x = left + i
+            bottom = top + height
+            for phase, color in colors.items():
+                bar = min(bottom - top, int(record.get(phase, 0.0) * scale))
+                if bar > 0:
+                    pygame.draw.line(screen, color, (x, bottom), (x, bottom - bar))
+                    bottom -= bar
+            rest = int(record["total"] * scale) - (top + height - bottom)
+            if rest > 0:
+                pygame.draw.line(screen, (120, 120, 120), (x, bottom), (x, max(top, bottom - rest)))
+        budget_y = top + height - int(FRAME_BUDGET_MS * scale)
+        pygame.draw.line(screen, (255, 60, 60), (left, budget_y), (left + width, budget_y))
+
+        total = self.summary()
+        period = self.summary("period")["mean"]
+        lines = [f"frame {total['mean']:.2f} ms  p95 {total['p95']:.2f}  max {total['max']:.2f}",
+                 f"fps {1000 / period:.0f}" if period else "fps -"]
+        for phase in PHASES:
+            lines.append(f"{phase:<10} {self.summary(phase)['mean']:.3f} ms")
+        last = self.frames[-1] if self.frames else {}
+        counts = [f"{key[:-6]}={value}" for key, value in last.items() if key.endswith("_count")]
+        lines.append(" ".join(counts[:3]))
+        lines.append(" ".join(counts[3:]))
+        if "pushed_bytes" in last:
+            lines.append(f"pushed {last['pushed_bytes'] / 1024:.0f} KiB/frame")
+        lines.extend(extra_lines)
+        y = top + height + 6
+        for line in lines:
+            screen.blit(self.font.render(line, True, (230, 230, 230)), (left, y))
+            y += 14
+        return panel
@@ -0,0 +1,59 @@
+"""Adaptive quality governor: trades visual detail for frame time.
+
+The governor is fed each frame's work time (everything but the frame-cap
+wait) and keeps a smoothed average. When the average stays over the frame
+budget it steps one quality level down; when it stays well under the budget
+for longer it steps back up. The gap between the two thresholds and the
+longer wait before recovering keep it from flapping between levels. What a
+level changes is up to the game (see QUALITY_LEVELS in space_shooter.py);
+the governor only picks the level.
+"""
+from profiler import FRAME_BUDGET_MS
+
+SMOOTHING = 0.1  # Weight of the newest frame in the moving average
+DEGRADE_AT = 0.9  # Fraction of the budget above which quality is lowered...
+DEGRADE_FRAMES = 15  # ...once the average has stayed there this many frames
+RECOVER_AT = 0.5  # Fraction of the budget below which quality is raised...
+RECOVER_FRAMES = 180  # ...once the average has stayed there this many frames
+
+
+class QualityGovernor:
+    """Picks a quality level (0 = best) from recent frame times"""
+    def __init__(self, levels, budget_ms=FRAME_BUDGET_MS):
+        self.max_level = levels - 1
+        self.budget_ms = budget_ms
+        self.level = 0
+        self.pinned = False  # Set by pin(); observe() then leaves the level alone
+        self.average = None
+        self.over = 0
+        self.under = 0
+        self.changes = 0
+
+    def pin(self, level):
+        """Hold a fixed level (for comparisons and benchmarks)"""
+        self.level = max(0, min(self.max_level, level))
+        self.pinned = True
+
+    def observe(self, frame_ms):
+        """Feed one frame's work time in milliseconds; return True when the level changed"""
+        if self.pinned:
+            return False
+        if self.average is None:
+            self.average = frame_ms
+        else:
+            self.average += (frame_ms - self.average) * SMOOTHING
+        self.over = self.over + 1 if self.average > self.budget_ms * DEGRADE_AT else 0
+        self.under = self.under + 1 if self.average < self.budget_ms * RECOVER_AT else 0
+        if self.over >= DEGRADE_FRAMES and self.level < self.max_level:
+            return self.set_level(self.level + 1)
+        if self.under >= RECOVER_FRAMES and self.level > 0:
+            return self.set_level(self.level - 1)
+        return False
+
+    def set_level(self, level):
+        """Move to level and start measuring afresh"""
+        self.level = level
+        self.average = None
+        self.over = self.under = 0
+        self.changes += 1
+        return True
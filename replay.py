@@ -0,0 +1,111 @@
+"""Input recording and replay for reproducible Space Shooter sessions.
+
+A recording holds the game's random seed and, for every rendered frame, the
+gameplay key presses handled that frame followed by the held movement keys of
+each simulation tick run in it. Key presses and held keys are stored as small
+indices and bit masks, so a frame with one tick costs three bytes. Because all
+gameplay randomness comes from the seeded Game.rng, feeding the same input
+back through handle_events/update reproduces the session exactly. Rewinding
+(Backspace) is part of the input too, so the header also stores the length of
+the rewind history the session was recorded with (0 when rewind was off).
+"""
+import struct
+
+import pygame
+
+MAGIC = b"SSRP"
+VERSION = 4
+HEADER = struct.Struct("<4sBHQI")  # magic, version, simulation rate, seed, rewind history ticks
+
+# Keys whose presses drive gameplay (shooting, restarting, rewinding); append only, indices are stored
+PRESS_KEYS = (pygame.K_SPACE, pygame.K_RETURN, pygame.K_r, pygame.K_BACKSPACE)
+# Keys read as held every tick (movement), one bit each
+HELD_KEYS = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN,
+             pygame.K_a, pygame.K_d, pygame.K_w, pygame.K_s)
+
+
+class ReplayKeys:
+    """Stands in for pygame.key.get_pressed() with a recorded held-key mask"""
+    __slots__ = ("mask",)
+
+    def __init__(self, mask):
+        self.mask = mask
+
+    def __getitem__(self, key):
+        return key in HELD_KEYS and bool(self.mask >> HELD_KEYS.index(key) & 1)
+
+
+def held_mask(keys):
+    """Bit mask of the movement keys held in a get_pressed()-like mapping"""
+    mask = 0
+    for bit, key in enumerate(HELD_KEYS):
+        if keys[key]:
+            mask |= 1 << bit
+    return mask
+
+
+class InputRecorder:
+    """Collects per-frame input while the game runs and writes it to a file"""
+    def __init__(self, seed, sim_rate, rewind_ticks=0):
+        self.seed = seed
+        self.sim_rate = sim_rate
+        self.rewind_ticks = rewind_ticks
+        self.data = bytearray()
+        self.presses = bytearray()
+        self.ticks = bytearray()
+        self.frames = 0
+
+    def press(self, key):
+        """Record a key press handled this frame (other keys are ignored)"""
+        if key in PRESS_KEYS:
+            self.presses.append(PRESS_KEYS.index(key))
+
+    def tick(self, keys):
+        """Record the keys held during one simulation tick"""
+        self.ticks.append(held_mask(keys))
+
+    def end_frame(self):
+        """Close the current frame's record"""
+        # Frames catching up after a long stall can run more than 255 ticks; split them
+        while len(self.presses) > 255 or len(self.ticks) > 255:
+            self.data += bytes((min(len(self.presses), 255),)) + self.presses[:255]
+            self.data += bytes((min(len(self.ticks), 255),)) + self.ticks[:255]
+            del self.presses[:255], self.ticks[:255]
+            self.frames += 1
+        self.data += bytes((len(self.presses),)) + self.presses
+        self.data += bytes((len(self.ticks),)) + self.ticks
+        self.presses.clear()
+        self.ticks.clear()
+        self.frames += 1
+
+    def save(self, path):
+        """Write the recording to path"""
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.sim_rate, self.seed, self.rewind_ticks))
+            f.write(self.data)
+
+
+class InputReplay:
+    """A recording loaded from disk"""
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            blob = f.read()
+        if len(blob) < HEADER.size:
+            raise ValueError(f"{path}: not a replay file")
+        magic, version, self.sim_rate, self.seed, self.rewind_ticks = HEADER.unpack_from(blob)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: not a replay file (or an unsupported version)")
+        self.data = blob[HEADER.size:]
+
+    def frames(self):
+        """Yield (pressed keys, held-key states per tick) for every recorded frame"""
+        data = self.data
+        i = 0
+        while i < len(data):
+            count = data[i]
+            presses = [PRESS_KEYS[index] for index in data[i + 1:i + 1 + count]]
+            i += 1 + count
+            count = data[i]
+            ticks = [ReplayKeys(mask) for mask in data[i + 1:i + 1 + count]]
+            i += 1 + count
+            yield presses, ticks
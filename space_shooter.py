@@ -1,15 +1,28 @@
+import math
 import pygame
 import random
+import struct
 import sys
+import threading
+import time
+from array import array
+from collections import deque
 from enum import Enum
+from itertools import repeat, starmap
+from operator import attrgetter
 
-# Initialize Pygame
-pygame.init()
+from profiler import FrameProfiler
+from quality import QualityGovernor
 
 # Constants
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
-FPS = 60
+FPS = 60  # Render frame cap (0 = uncapped)
+
+# Fixed simulation timestep; all speeds and timers are per simulation tick
+SIM_RATE = 60
+SIM_DT = 1.0 / SIM_RATE
+MAX_FRAME_TIME = 0.25  # Clamp long frames so a stall cannot trigger an endless catch-up
 
 # Colors (RGB)
 BLACK = (0, 0, 0)
@@ -19,56 +32,604 @@ GREEN = (0, 255, 0)
 BLUE = (0, 0, 255)
 YELLOW = (255, 255, 0)
 CYAN = (0, 255, 255)
+ORANGE = (255, 140, 0)
+
+# Presentation: every frame is rendered at SCREEN_WIDTH x SCREEN_HEIGHT and then scaled up to the
+# window, so rendering cost does not depend on the output resolution.
+#   "scaled"  - SDL's renderer stretches the frame on the GPU (pygame.SCALED, nearest-neighbour)
+#   "integer" - one nearest-neighbour blit at the largest whole factor that fits, centred
+#   "native"  - an unscaled SCREEN_WIDTH x SCREEN_HEIGHT window
+DISPLAY_SCALING = "scaled"
+
+# Sprite files
+PLAYER_IMAGE = "Pasted Graphic-1.png"
+ENEMY_IMAGE = "Pasted Graphic 2.png"
+PLAYER_SIZE = (40, 30)
+ENEMY_SIZE = (30, 25)
+
+# Asteroid rotation atlas settings
+ASTEROID_ROTATION_STEPS = 64  # Frames per full turn; higher is smoother but uses more memory
+ASTEROID_SIZE_STEP = 5  # Asteroids are drawn from atlases shared per size class of this many pixels
+ASTEROID_COLOR = (100, 100, 100)
+ASTEROID_MIN_SIZE = 20
+ASTEROID_MAX_SIZE = 40
+
+# Collision broadphase grid cell size (pixels); about the size of the largest entity
+COLLISION_CELL_SIZE = 64
+
+# Player hits are confirmed against cached sprite masks after the rect broadphase, so
+# transparent corners no longer kill. Opaque images on a flat background (the PNG sprites)
+# treat the colour around their corner, within this tolerance per channel, as transparent.
+PIXEL_COLLISIONS = True
+MASK_BACKGROUND_TOLERANCE = 24
+
+# Projectile pools are pre-sized to this many objects and grow when exhausted
+BULLET_POOL_SIZE = 64
+ENEMY_BULLET_POOL_SIZE = 64
+
+# Enemies wait a random number of ticks in this range between shots
+ENEMY_SHOOT_DELAY = (60, 120)
+
+# Rewind history: a snapshot per simulation tick, and how far back each Backspace press goes
+REWIND_SECONDS = 10  # 0 disables rewinding
+REWIND_STEP_SECONDS = 2
+
+# Snapshot layout: state, score, lives, timers and enemy/asteroid spawn delays, both players' positions,
+# the random generator's gauss cache, then the entity counts of the four gameplay groups (stars are
+# decorative and come from star_rng, so they are left out)
+SNAPSHOT_HEADER = struct.Struct("<Bqi6i8f?d4I")
+# Entity fields are packed as int32 (integer fields), float32 (positions) or doubles (speeds and angles)
+SNAPSHOT_INT_FIELDS = frozenset(("brightness", "size", "width", "height", "shoot_timer", "shoot_delay"))
+SNAPSHOT_FLOAT32_FIELDS = frozenset(("x", "y", "prev_x", "prev_y"))
+
+# Adaptive quality levels, best first; the governor (quality.py) steps down them while frames run
+# over budget. Every setting is visual only: stars and effects draw from their own random generators.
+QUALITY_GOVERNOR = True  # False keeps level 0 unless --quality pins another
+QUALITY_LEVELS = (
+    {"star_spawn_delay": 2, "rotation_steps": ASTEROID_ROTATION_STEPS, "effects": True, "render_scale": 1.0},
+    {"star_spawn_delay": 6, "rotation_steps": ASTEROID_ROTATION_STEPS, "effects": True, "render_scale": 1.0},
+    {"star_spawn_delay": 6, "rotation_steps": 16, "effects": True, "render_scale": 1.0},
+    {"star_spawn_delay": 6, "rotation_steps": 16, "effects": False, "render_scale": 1.0},
+    {"star_spawn_delay": 6, "rotation_steps": 16, "effects": False, "render_scale": 0.5},
+)
+
+# Dirty-rect mode falls back to a full redraw when changed regions cover more of the screen than this
+DIRTY_RECT_MAX_COVERAGE = 0.5
+
+# Loading screen redraw interval (seconds) while assets decode in the background
+LOADING_FRAME_TIME = 1 / 30
+
+# Draw the score from pre-rendered digit glyphs instead of re-rasterizing it when it changes
+HUD_DIGIT_ATLAS = False
+CONTROLS_TEXT = "P1: Arrows+Space | P2: WASD+Enter"
 
 class GameState(Enum):
     PLAYING = 1
     GAME_OVER = 2
 
+class RotationAtlas:
+    """Pre-rendered rotation frames of one asteroid size class"""
+    def __init__(self, width, height, steps):
+        self.width = width
+        self.height = height
+        self.steps = steps
+        base = pygame.Surface((width, height), pygame.SRCALPHA)
+        draw_asteroid_shape(base, width, height)
+        self.frames = []
+        self.offsets = []
+        self.masks = [None] * steps  # Collision masks, built per frame on first use
+        for i in range(steps):
+            frame = pygame.transform.rotate(base, i * 360 / steps)
+            if pygame.display.get_surface() is not None:
+                frame = frame.convert_alpha()
+            self.frames.append(frame)
+            # Offset from the asteroid centre to the frame's top-left corner
+            self.offsets.append((-(frame.get_width() // 2), -(frame.get_height() // 2)))
+
+    def index(self, angle):
+        """Index of the frame closest to angle (degrees)"""
+        return int(round(angle * self.steps / 360)) % self.steps
+
+    def mask(self, index):
+        """Collision mask of one frame"""
+        mask = self.masks[index]
+        if mask is None:
+            mask = self.masks[index] = pygame.mask.from_surface(self.frames[index])
+        return mask
+
+    def memory_bytes(self):
+        """Approximate pixel memory held by the frames"""
+        return sum(frame.get_width() * frame.get_height() * frame.get_bytesize() for frame in self.frames)
+
+class AssetManager:
+    """Loads each sprite once and hands out shared references"""
+    def __init__(self, rotation_steps=ASTEROID_ROTATION_STEPS):
+        self.surfaces = {}
+        self.atlases = {}  # Keyed by (width class, height class, rotation steps)
+        self.scaled_surfaces = {}
+        self.masks = {}
+        self.untinted = {}  # Tinted surface -> how to load its original, whose shape its mask uses
+        self.rotation_steps = rotation_steps
+
+    def sprite(self, name, path, size, tint=None, placeholder=None):
+        """Return the cached surface for name, decoding it on first use"""
+        surface = self.surfaces.get(name)
+        if surface is None:
+            surface = self._load(path, size, tint, placeholder)
+            self.surfaces[name] = surface
+            if tint:
+                self.untinted[surface] = (path, size, placeholder)
+        return surface
+
+    def _load(self, path, size, tint, placeholder):
+        """Decode, scale and convert an image, or rasterize its placeholder"""
+        try:
+            surface = pygame.transform.scale(pygame.image.load(path), size)
+            if tint:
+                surface.fill(tint, special_flags=pygame.BLEND_MULT)
+        except (pygame.error, FileNotFoundError):
+            # Fallback to a pre-rasterized placeholder if the image fails to load.
+            # One extra pixel each way keeps the polygon's bottom/right edge visible.
+            surface = pygame.Surface((size[0] + 1, size[1] + 1), pygame.SRCALPHA)
+            if placeholder:
+                placeholder(surface, size[0], size[1])
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        return surface
+
+    def shape(self, name, build):
+        """Return the cached result of build() (a surface or table of surfaces) for name"""
+        shape = self.surfaces.get(name)
+        if shape is None:
+            shape = build()
+            self.surfaces[name] = shape
+        return shape
+
+    def rotation_atlas(self, width, height, steps=None):
+        """Return the shared rotation atlas for an asteroid of this size (at the current steps by default)"""
+        key = (asteroid_size_class(width), asteroid_size_class(height), steps or self.rotation_steps)
+        atlas = self.atlases.get(key)
+        if atlas is None:
+            atlas = RotationAtlas(*key)
+            self.atlases[key] = atlas
+        return atlas
+
+    def collision_atlas(self, width, height):
+        """Rotation atlas at the full ASTEROID_ROTATION_STEPS, so hits never depend on the render quality"""
+        return self.rotation_atlas(width, height, ASTEROID_ROTATION_STEPS)
+
+    def mask(self, surface):
+        """Cached collision mask of a shared surface, see surface_mask.
+
+        A tinted sprite gets the mask of its untinted original, so tinting (which can darken
+        pixels into the keyed-out background) never changes a hitbox.
+        """
+        mask = self.masks.get(surface)
+        if mask is None:
+            source = self.untinted.get(surface)
+            if source is not None:
+                path, size, placeholder = source
+                mask = surface_mask(self._load(path, size, None, placeholder))
+            else:
+                mask = surface_mask(surface)
+            self.masks[surface] = mask
+        return mask
+
+    def set_rotation_steps(self, steps):
+        """Change the asteroid angle resolution, dropping atlases built at the old one.
+
+        Full-resolution atlases stay, since collisions always use them (see collision_atlas).
+        """
+        if steps != self.rotation_steps:
+            self.rotation_steps = steps
+            for key in [key for key in self.atlases if key[2] not in (steps, ASTEROID_ROTATION_STEPS)]:
+                del self.atlases[key]
+            self.scaled_surfaces.clear()
+
+    def scaled(self, surface, scale):
+        """Cached copy of a shared surface resized by scale, for reduced-resolution rendering"""
+        key = (surface, scale)
+        result = self.scaled_surfaces.get(key)
+        if result is None:
+            size = (max(1, round(surface.get_width() * scale)), max(1, round(surface.get_height() * scale)))
+            result = pygame.transform.scale(surface, size)
+            self.scaled_surfaces[key] = result
+        return result
+
+ASSETS = AssetManager()
+
+def surface_mask(surface):
+    """Collision mask of a sprite: its opaque pixels.
+    
+    A fully opaque image is assumed to sit on a flat background; the region connected to its
+    top-left corner in that colour counts as transparent. Plain filled shapes (bullets) have
+    nothing else left and keep their full rectangle.
+    """
+    mask = pygame.mask.from_surface(surface)
+    width, height = surface.get_size()
+    if mask.count() == width * height:
+        tolerance = (MASK_BACKGROUND_TOLERANCE,) * 3 + (255,)
+        shape = pygame.mask.from_threshold(surface, surface.get_at((0, 0)), tolerance).connected_component((0, 0))
+        shape.invert()
+        if shape.count():
+            mask = shape
+    return mask
+
+def sprite_mask(entity):
+    """Cached mask of an entity's shared sprite and the integer position it sits at.
+    
+    Sprite-drawn entities use this as their collision_mask method (see PIXEL_COLLISIONS).
+    """
+    return ASSETS.mask(entity.sprite), (int(entity.x), int(entity.y))
+
+def masks_overlap(mask, position, other_mask, other_position):
+    """True when two masks placed at integer positions share a set pixel"""
+    offset = (other_position[0] - position[0], other_position[1] - position[1])
+    return mask.overlap(other_mask, offset) is not None
+
+def draw_player_placeholder(surface, width, height, color, body_color):
+    """Draw the simple pixel-style player spaceship at the origin"""
+    pygame.draw.polygon(surface, color, [
+        (width // 2, 0),  # Top point
+        (0, height),      # Bottom left
+        (width // 4, height * 0.7),  # Left wing
+        (width * 3 // 4, height * 0.7),  # Right wing
+        (width, height)  # Bottom right
+    ])
+    # Ship body
+    pygame.draw.rect(surface, body_color, (width // 3, height // 3, width // 3, height // 2))
+
+def draw_enemy_placeholder(surface, width, height):
+    """Draw the simple pixel-style enemy ship at the origin"""
+    pygame.draw.polygon(surface, RED, [
+        (width // 2, height),  # Bottom point
+        (0, 0),                # Top left
+        (width // 4, height * 0.3),  # Left wing
+        (width * 3 // 4, height * 0.3),  # Right wing
+        (width, 0)  # Top right
+    ])
+    # Enemy body
+    pygame.draw.rect(surface, (200, 0, 0), (width // 4, height // 3, width // 2, height // 2))
+
+def solid_surface(size, color):
+    """Opaque single-colour surface, converted for fast blitting when a display exists"""
+    surface = pygame.Surface(size)
+    surface.fill(color)
+    return surface.convert() if pygame.display.get_surface() is not None else surface
+
+def build_star_sprites():
+    """Star circles indexed [size][brightness]; each is blitted size pixels up-left of the centre"""
+    table = [None]
+    for size in (1, 2):
+        row = []
+        for brightness in range(256):
+            # Stars sit on black space, so a black colour key is cheaper to blit than per-pixel alpha
+            surface = pygame.Surface((size * 2, size * 2))
+            pygame.draw.circle(surface, (brightness, brightness, brightness), (size, size), size)
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert()
+            surface.set_colorkey(BLACK, pygame.RLEACCEL)
+            row.append(surface)
+        table.append(row)
+    return table
+
+def build_bullet_sprite():
+    """Player bullet rectangle"""
+    return solid_surface((4, 10), YELLOW)
+
+def build_enemy_bullet_sprite():
+    """Enemy bullet rectangle"""
+    return solid_surface((4, 8), RED)
+
+def bullet_sprite():
+    """Shared pre-rasterized player bullet"""
+    return ASSETS.shape("bullet", build_bullet_sprite)
+
+def enemy_bullet_sprite():
+    """Shared pre-rasterized enemy bullet"""
+    return ASSETS.shape("enemy_bullet", build_enemy_bullet_sprite)
+
+def star_sprites():
+    """Shared pre-rasterized star circles, see build_star_sprites"""
+    return ASSETS.shape("stars", build_star_sprites)
+
+def draw_asteroid_shape(surface, width, height):
+    """Draw a rough asteroid shape at the origin"""
+    pygame.draw.polygon(surface, ASTEROID_COLOR, [
+        (width // 2, 0),
+        (width, height // 3),
+        (width * 0.8, height * 0.7),
+        (width * 0.6, height),
+        (width * 0.3, height * 0.8),
+        (0, height * 0.5),
+        (width * 0.2, height * 0.2)
+    ])
+
+def asteroid_size_class(size):
+    """Round an asteroid dimension to its shared atlas size class"""
+    return max(ASTEROID_SIZE_STEP, int(round(size / ASTEROID_SIZE_STEP)) * ASTEROID_SIZE_STEP)
+
+def player_sprite(player_id):
+    """Shared sprite for a player; player 2 gets a green-tinted copy"""
+    if player_id == 1:
+        return ASSETS.sprite("player1", PLAYER_IMAGE, PLAYER_SIZE,
+                             placeholder=lambda s, w, h: draw_player_placeholder(s, w, h, CYAN, BLUE))
+    return ASSETS.sprite("player2", PLAYER_IMAGE, PLAYER_SIZE, tint=(0, 255, 0, 128),
+                         placeholder=lambda s, w, h: draw_player_placeholder(s, w, h, GREEN, (0, 150, 0)))
+
+def enemy_sprite():
+    """Shared sprite for enemies"""
+    return ASSETS.sprite("enemy", ENEMY_IMAGE, ENEMY_SIZE, placeholder=draw_enemy_placeholder)
+
+def init_pygame():
+    """Bring up only the pygame modules the game uses (add pygame.mixer here once there is sound)"""
+    pygame.display.init()
+    pygame.font.init()
+
+class AssetLoader:
+    """Decodes every sprite and atlas and opens the fonts, optionally on a background thread"""
+    def __init__(self):
+        self.fonts = None
+        self.steps = [lambda: player_sprite(1), lambda: player_sprite(2), enemy_sprite,
+                      bullet_sprite, enemy_bullet_sprite, star_sprites, self.load_fonts]
+        for w in range(ASTEROID_MIN_SIZE, ASTEROID_MAX_SIZE + 1, ASTEROID_SIZE_STEP):
+            for h in range(ASTEROID_MIN_SIZE, ASTEROID_MAX_SIZE + 1, ASTEROID_SIZE_STEP):
+                self.steps.append(lambda w=w, h=h: ASSETS.rotation_atlas(w, h))
+        self.done = 0
+        self.error = None
+        self.thread = None
+
+    def load_fonts(self):
+        """Open the HUD fonts"""
+        self.fonts = (pygame.font.Font(None, 36), pygame.font.Font(None, 72))
+
+    def load(self):
+        """Run every step, keeping the first error for wait() to raise"""
+        try:
+            for step in self.steps:
+                step()
+                self.done += 1
+        except Exception as error:
+            self.error = error
+
+    def start(self):
+        """Load on a background thread; the display must already be open so sprites can be converted"""
+        self.thread = threading.Thread(target=self.load, name="asset-loader", daemon=True)
+        self.thread.start()
+
+    def progress(self):
+        """Fraction of the steps finished"""
+        return self.done / len(self.steps)
+
+    def finished(self):
+        """True once loading has stopped, successfully or not"""
+        return self.thread is None or not self.thread.is_alive()
+
+    def wait(self, timeout=None):
+        """Wait up to timeout seconds for the thread; once it is done, raise any error it hit"""
+        if self.thread is not None:
+            self.thread.join(timeout)
+        if self.error is not None and self.finished():
+            raise self.error
+
+def update_entities(entities, pool=None):
+    """Update every entity in place and drop off-screen ones in a single compacting pass"""
+    if not isinstance(entities, list):
+        entities.update()  # Vectorized groups advance and cull themselves
+        return
+    kept = 0
+    for entity in entities:
+        entity.update()
+        if not entity.is_off_screen():
+            entities[kept] = entity
+            kept += 1
+        elif pool is not None:
+            pool.release(entity)
+    del entities[kept:]
+
+class ObjectPool:
+    """Recycles short-lived entities instead of allocating a new object per spawn"""
+    def __init__(self, factory, size):
+        self.factory = factory
+        self.free = [factory() for _ in range(size)]
+        self.allocated = size
+        self.live = 0
+        self.high_water = 0
+    
+    def acquire(self, *args):
+        """Take a free object (allocating only if the pool is empty) and reset it"""
+        if self.free:
+            obj = self.free.pop()
+        else:
+            obj = self.factory()
+            self.allocated += 1
+        obj.reset(*args)
+        self.live += 1
+        if self.live > self.high_water:
+            self.high_water = self.live
+        return obj
+    
+    def release(self, obj):
+        """Return an object to the pool; the caller must drop every reference to it"""
+        self.live -= 1
+        self.free.append(obj)
+    
+    def release_all(self, objs):
+        """Return every object in objs to the pool"""
+        self.live -= len(objs)
+        self.free.extend(objs)
+    
+    def stats(self):
+        """Live, free, high-water and total allocated object counts"""
+        return {"live": self.live, "free": len(self.free), "high_water": self.high_water,
+                "allocated": self.allocated}
+
+class SnapshotRing:
+    """Bounded history of game snapshots for rewinding, with capture and restore costs"""
+    def __init__(self, capacity):
+        self.snapshots = deque(maxlen=capacity)
+        self.captures = 0
+        self.capture_seconds = 0.0
+        self.restores = 0
+        self.restore_seconds = 0.0
+    
+    def __len__(self):
+        return len(self.snapshots)
+    
+    def push(self, game):
+        """Capture game's state, dropping the oldest snapshot when full"""
+        start = time.perf_counter()
+        self.snapshots.append(game.snapshot())
+        self.capture_seconds += time.perf_counter() - start
+        self.captures += 1
+    
+    def rewind(self, game, ticks):
+        """Restore game to ticks snapshots ago (or the oldest one kept); return False if empty"""
+        if not self.snapshots:
+            return False
+        for _ in range(min(ticks, len(self.snapshots) - 1)):
+            self.snapshots.pop()
+        start = time.perf_counter()
+        game.restore(self.snapshots[-1])
+        self.restore_seconds += time.perf_counter() - start
+        self.restores += 1
+        return True
+    
+    def stats(self):
+        """Snapshots held, their total and mean size in bytes, and mean capture/restore time in microseconds"""
+        total = sum(len(snapshot) for snapshot in self.snapshots)
+        count = len(self.snapshots)
+        return {"snapshots": count, "bytes": total, "mean_bytes": total / count if count else 0.0,
+                "capture_us": self.capture_seconds * 1e6 / self.captures if self.captures else 0.0,
+                "restore_us": self.restore_seconds * 1e6 / self.restores if self.restores else 0.0}
+
+def entity_fields(kind):
+    """Fields of an entity class stored in snapshots (and vectorized groups): everything but the sprite"""
+    return tuple(name for name in kind.__slots__ if name != "sprite")
+
+def field_code(name):
+    """struct code a snapshot packs an entity field as"""
+    if name in SNAPSHOT_INT_FIELDS:
+        return "i"
+    return "f" if name in SNAPSHOT_FLOAT32_FIELDS else "d"
+
+ENTITY_RECORDS = {}
+
+def entity_record(kind):
+    """struct.Struct of one entity's fields in snapshots"""
+    record = ENTITY_RECORDS.get(kind)
+    if record is None:
+        record = ENTITY_RECORDS[kind] = struct.Struct("<" + "".join(map(field_code, entity_fields(kind))))
+    return record
+
+def entity_dtype(kind):
+    """NumPy structured dtype with the same layout as entity_record, for vectorized groups"""
+    import numpy as np
+    return np.dtype([(name, "<" + field_code(name)) for name in entity_fields(kind)])
+
+def pack_entities(entities, kind):
+    """Every entity's fields as consecutive entity_record records"""
+    if not isinstance(entities, list):
+        return entities.records(entity_dtype(kind)).tobytes()  # Vectorized groups pack straight from their arrays
+    return b"".join(starmap(entity_record(kind).pack, map(attrgetter(*entity_fields(kind)), entities)))
+
+def load_entities(entities, kind, data, count, pool=None):
+    """Replace the contents of a group with count entities unpacked from pack_entities data"""
+    fields = entity_fields(kind)
+    if not isinstance(entities, list):
+        import numpy as np
+        entities.load(np.frombuffer(data, dtype=entity_dtype(kind), count=count))
+        return
+    columns = zip(*entity_record(kind).iter_unpack(data))
+    # Reuse the group's current objects; only the difference is allocated or returned to the pool
+    if count < len(entities):
+        if pool is not None:
+            pool.release_all(entities[count:])
+        del entities[count:]
+    while len(entities) < count:
+        if pool is not None:
+            entities.append(pool.acquire(0, 0))
+        else:
+            entity = kind.__new__(kind)
+            if kind is Enemy:
+                entity.sprite = enemy_sprite()
+            entities.append(entity)
+    # Assign field by field; map() runs each column's setattr calls without a Python-level loop
+    for name, column in zip(fields, columns):
+        deque(map(setattr, entities, repeat(name), column), maxlen=0)
+
+def lerp(previous, current, alpha):
+    """Interpolate between the last two simulation states"""
+    return previous + (current - previous) * alpha
+
+def draw_entities(entities, screen, alpha=1.0, dirty=None, scale=1.0):
+    """Draw every entity of a group, alpha of the way from its previous to its current state.
+    
+    The group is submitted as one batched Surface.blits call. When dirty is a
+    list, the rect touched by each entity is appended to it. A scale below 1
+    draws into a reduced-resolution surface with resized sprites.
+    """
+    if isinstance(entities, list):
+        batch = [entity.blit_args(alpha) for entity in entities]
+    else:
+        batch = entities.blit_batch(alpha)  # Vectorized groups build theirs straight from their arrays
+    if scale != 1.0:
+        scaled = ASSETS.scaled
+        batch = [(scaled(surface, scale), (x * scale, y * scale)) for surface, (x, y) in batch]
+    if dirty is None:
+        screen.blits(batch, doreturn=False)
+    else:
+        dirty.extend(screen.blits(batch))
+
 class Star:
     """Star class for background starfield"""
-    def __init__(self, x, y):
+    __slots__ = ("x", "y", "prev_y", "speed", "brightness", "size", "sprite")
+    
+    def __init__(self, x, y, rng=random):
         self.x = x
         self.y = y
-        self.speed = random.uniform(0.5, 3.0)
-        self.brightness = random.randint(100, 255)
-        self.size = random.randint(1, 2)
+        self.prev_y = y
+        self.speed = rng.uniform(0.5, 3.0)
+        self.brightness = rng.randint(100, 255)
+        self.size = rng.randint(1, 2)
+        self.sprite = star_sprites()[self.size][self.brightness]
         
     def update(self):
         """Update star position"""
+        self.prev_y = self.y
         self.y += self.speed
         
-    def draw(self, screen):
-        """Draw the star"""
-        color = (self.brightness, self.brightness, self.brightness)
-        pygame.draw.circle(screen, color, (int(self.x), int(self.y)), self.size)
-    
+    def blit_args(self, alpha=1.0):
+        """Pre-rasterized star circle and where to blit it"""
+        prev_y = self.prev_y
+        size = self.size
+        return self.sprite, (int(self.x) - size, int(prev_y + (self.y - prev_y) * alpha) - size)
+        
     def is_off_screen(self):
         """Check if star is off screen"""
         return self.y > SCREEN_HEIGHT
 
 class Player:
     """Player spaceship class"""
+    __slots__ = ("x", "y", "prev_x", "prev_y", "speed", "player_id", "color", "sprite", "width", "height")
+    
     def __init__(self, x, y, player_id=1):
         self.x = x
         self.y = y
+        self.prev_x = x
+        self.prev_y = y
         self.speed = 5
         self.player_id = player_id
         self.color = CYAN if player_id == 1 else GREEN  # Different colors for each player
         
-        # Load player sprite
-        try:
-            self.sprite = pygame.image.load("Pasted Graphic-1.png")
-            self.sprite = pygame.transform.scale(self.sprite, (40, 30))  # Resize to fit game
-            self.width = self.sprite.get_width()
-            self.height = self.sprite.get_height()
-        except pygame.error:
-            # Fallback to simple drawing if image fails to load
-            self.sprite = None
-            self.width = 40
-            self.height = 30
+        # Shared sprite from the asset cache (no disk access after the first load)
+        self.sprite = player_sprite(player_id)
+        self.width, self.height = PLAYER_SIZE
         
     def move(self, dx, dy):
         """Move the player ship"""
+        self.prev_x = self.x
+        self.prev_y = self.y
         self.x += dx * self.speed
         self.y += dy * self.speed
         
@@ -76,52 +637,45 @@ class Player:
         self.x = max(0, min(SCREEN_WIDTH - self.width, self.x))
         self.y = max(0, min(SCREEN_HEIGHT - self.height, self.y))
     
-    def draw(self, screen):
-        """Draw the player spaceship"""
-        if self.sprite:
-            # Draw the loaded sprite with color tinting
-            if self.player_id == 2:
-                # Create a green-tinted version for player 2
-                tinted_sprite = self.sprite.copy()
-                tinted_sprite.fill((0, 255, 0, 128), special_flags=pygame.BLEND_MULT)
-                screen.blit(tinted_sprite, (self.x, self.y))
-            else:
-                screen.blit(self.sprite, (self.x, self.y))
-        else:
-            # Fallback to simple pixel-style spaceship
-            pygame.draw.polygon(screen, self.color, [
-                (self.x + self.width // 2, self.y),  # Top point
-                (self.x, self.y + self.height),      # Bottom left
-                (self.x + self.width // 4, self.y + self.height * 0.7),  # Left wing
-                (self.x + self.width * 3 // 4, self.y + self.height * 0.7),  # Right wing
-                (self.x + self.width, self.y + self.height)  # Bottom right
-            ])
-            # Ship body
-            body_color = BLUE if self.player_id == 1 else (0, 150, 0)
-            pygame.draw.rect(screen, body_color, (self.x + self.width // 3, self.y + self.height // 3, 
-                                                 self.width // 3, self.height // 2))
+    def blit_args(self, alpha=1.0):
+        """Sprite and where to blit it"""
+        return self.sprite, (lerp(self.prev_x, self.x, alpha), lerp(self.prev_y, self.y, alpha))
     
     def get_rect(self):
         """Get collision rectangle"""
         return pygame.Rect(self.x, self.y, self.width, self.height)
+    
+    collision_mask = sprite_mask
 
 class Bullet:
     """Bullet class for player shots"""
+    __slots__ = ("x", "y", "prev_y", "width", "height", "speed", "sprite")
+    
     def __init__(self, x, y):
         self.x = x
         self.y = y
+        self.prev_y = y
+        self.sprite = bullet_sprite()
         self.width = 4
         self.height = 10
         self.speed = 7
+    
+    def reset(self, x, y):
+        """Reposition a recycled bullet"""
+        self.x = x
+        self.y = y
+        self.prev_y = y
         
     def update(self):
         """Update bullet position"""
+        self.prev_y = self.y
         self.y -= self.speed
         
-    def draw(self, screen):
-        """Draw the bullet"""
-        pygame.draw.rect(screen, YELLOW, (self.x, self.y, self.width, self.height))
-    
+    def blit_args(self, alpha=1.0):
+        """Pre-rasterized bullet and where to blit it"""
+        prev_y = self.prev_y
+        return self.sprite, (self.x, prev_y + (self.y - prev_y) * alpha)
+        
     def is_off_screen(self):
         """Check if bullet is off screen"""
         return self.y < 0
@@ -132,21 +686,33 @@ class Bullet:
 
 class EnemyBullet:
     """Enemy bullet class"""
+    __slots__ = ("x", "y", "prev_y", "width", "height", "speed", "sprite")
+    
     def __init__(self, x, y):
         self.x = x
         self.y = y
+        self.prev_y = y
+        self.sprite = enemy_bullet_sprite()
         self.width = 4
         self.height = 8
         self.speed = 4
+    
+    def reset(self, x, y):
+        """Reposition a recycled bullet"""
+        self.x = x
+        self.y = y
+        self.prev_y = y
         
     def update(self):
         """Update bullet position"""
+        self.prev_y = self.y
         self.y += self.speed
         
-    def draw(self, screen):
-        """Draw the enemy bullet"""
-        pygame.draw.rect(screen, RED, (self.x, self.y, self.width, self.height))
-    
+    def blit_args(self, alpha=1.0):
+        """Pre-rasterized enemy bullet and where to blit it"""
+        prev_y = self.prev_y
+        return self.sprite, (self.x, prev_y + (self.y - prev_y) * alpha)
+        
     def is_off_screen(self):
         """Check if bullet is off screen"""
         return self.y > SCREEN_HEIGHT
@@ -154,44 +720,37 @@ class EnemyBullet:
     def get_rect(self):
         """Get collision rectangle"""
         return pygame.Rect(self.x, self.y, self.width, self.height)
+    
+    collision_mask = sprite_mask
 
 class Asteroid:
     """Asteroid obstacle class"""
-    def __init__(self, x, y):
+    __slots__ = ("x", "y", "prev_y", "width", "height", "speed", "rotation", "rotation_speed")
+    
+    def __init__(self, x, y, rng=random):
         self.x = x
         self.y = y
-        self.width = random.randint(20, 40)
-        self.height = random.randint(20, 40)
-        self.speed = random.uniform(1, 2.5)
+        self.prev_y = y
+        self.width = rng.randint(ASTEROID_MIN_SIZE, ASTEROID_MAX_SIZE)
+        self.height = rng.randint(ASTEROID_MIN_SIZE, ASTEROID_MAX_SIZE)
+        self.speed = rng.uniform(1, 2.5)
         self.rotation = 0
-        self.rotation_speed = random.uniform(-3, 3)
+        self.rotation_speed = rng.uniform(-3, 3)
         
     def update(self):
         """Update asteroid position and rotation"""
+        self.prev_y = self.y
         self.y += self.speed
         self.rotation += self.rotation_speed
         
-    def draw(self, screen):
-        """Draw the asteroid"""
-        # Create a rotated surface for the asteroid
-        asteroid_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        # Draw a rough asteroid shape
-        pygame.draw.polygon(asteroid_surface, (100, 100, 100), [
-            (self.width // 2, 0),
-            (self.width, self.height // 3),
-            (self.width * 0.8, self.height * 0.7),
-            (self.width * 0.6, self.height),
-            (self.width * 0.3, self.height * 0.8),
-            (0, self.height * 0.5),
-            (self.width * 0.2, self.height * 0.2)
-        ])
-        
-        # Rotate the asteroid
-        rotated_asteroid = pygame.transform.rotate(asteroid_surface, self.rotation)
-        # Center the rotated asteroid
-        rect = rotated_asteroid.get_rect(center=(self.x + self.width // 2, self.y + self.height // 2))
-        screen.blit(rotated_asteroid, rect)
-    
+    def blit_args(self, alpha=1.0):
+        """Nearest pre-rendered rotation frame and where to blit it, centred on the asteroid"""
+        atlas = ASSETS.rotation_atlas(self.width, self.height)
+        index = atlas.index(self.rotation)
+        ox, oy = atlas.offsets[index]
+        y = lerp(self.prev_y, self.y, alpha)
+        return atlas.frames[index], (self.x + self.width // 2 + ox, y + self.height // 2 + oy)
+        
     def is_off_screen(self):
         """Check if asteroid is off screen"""
         return self.y > SCREEN_HEIGHT
@@ -199,30 +758,34 @@ class Asteroid:
     def get_rect(self):
         """Get collision rectangle"""
         return pygame.Rect(self.x, self.y, self.width, self.height)
+    
+    def collision_mask(self):
+        """Mask of the rotation frame closest to the current angle, and where it sits (centred like blit_args)"""
+        atlas = ASSETS.collision_atlas(self.width, self.height)
+        index = atlas.index(self.rotation)
+        ox, oy = atlas.offsets[index]
+        rect = self.get_rect()
+        return atlas.mask(index), (rect.x + self.width // 2 + ox, rect.y + self.height // 2 + oy)
 
 class Enemy:
     """Enemy spaceship class"""
-    def __init__(self, x, y):
+    __slots__ = ("x", "y", "prev_y", "speed", "shoot_timer", "shoot_delay", "sprite", "width", "height")
+    
+    def __init__(self, x, y, rng=random, shoot_delay=ENEMY_SHOOT_DELAY):
         self.x = x
         self.y = y
-        self.speed = random.uniform(1, 3)
+        self.prev_y = y
+        self.speed = rng.uniform(1, 3)
         self.shoot_timer = 0
-        self.shoot_delay = random.randint(60, 120)  # Random shooting delay
+        self.shoot_delay = rng.randint(*shoot_delay)  # Random shooting delay
         
-        # Load enemy sprite
-        try:
-            self.sprite = pygame.image.load("Pasted Graphic 2.png")
-            self.sprite = pygame.transform.scale(self.sprite, (30, 25))  # Resize to fit game
-            self.width = self.sprite.get_width()
-            self.height = self.sprite.get_height()
-        except pygame.error:
-            # Fallback to simple drawing if image fails to load
-            self.sprite = None
-            self.width = 30
-            self.height = 25
+        # Shared sprite from the asset cache (no disk access after the first load)
+        self.sprite = enemy_sprite()
+        self.width, self.height = ENEMY_SIZE
         
     def update(self):
         """Update enemy position and shooting timer"""
+        self.prev_y = self.y
         self.y += self.speed
         self.shoot_timer += 1
     
@@ -230,29 +793,16 @@ class Enemy:
         """Check if enemy can shoot"""
         return self.shoot_timer >= self.shoot_delay
     
-    def shoot(self):
-        """Create an enemy bullet"""
+    def shoot(self, pool=None, rng=random, shoot_delay=ENEMY_SHOOT_DELAY):
+        """Create an enemy bullet, recycled from pool when one is given"""
         self.shoot_timer = 0
-        self.shoot_delay = random.randint(60, 120)  # Reset delay
-        return EnemyBullet(self.x + self.width // 2 - 2, self.y + self.height)
-        
-    def draw(self, screen):
-        """Draw the enemy spaceship"""
-        if self.sprite:
-            # Draw the loaded sprite
-            screen.blit(self.sprite, (self.x, self.y))
-        else:
-            # Fallback to simple pixel-style enemy ship
-            pygame.draw.polygon(screen, RED, [
-                (self.x + self.width // 2, self.y + self.height),  # Bottom point
-                (self.x, self.y),                                   # Top left
-                (self.x + self.width // 4, self.y + self.height * 0.3),  # Left wing
-                (self.x + self.width * 3 // 4, self.y + self.height * 0.3),  # Right wing
-                (self.x + self.width, self.y)  # Top right
-            ])
-            # Enemy body
-            pygame.draw.rect(screen, (200, 0, 0), (self.x + self.width // 4, self.y + self.height // 3, 
-                                                  self.width // 2, self.height // 2))
+        self.shoot_delay = rng.randint(*shoot_delay)  # Reset delay
+        x, y = self.x + self.width // 2 - 2, self.y + self.height
+        return pool.acquire(x, y) if pool is not None else EnemyBullet(x, y)
+        
+    def blit_args(self, alpha=1.0):
+        """Sprite and where to blit it"""
+        return self.sprite, (self.x, lerp(self.prev_y, self.y, alpha))
     
     def is_off_screen(self):
         """Check if enemy is off screen"""
@@ -261,15 +811,138 @@ class Enemy:
     def get_rect(self):
         """Get collision rectangle"""
         return pygame.Rect(self.x, self.y, self.width, self.height)
+    
+    collision_mask = sprite_mask
+
+class TextCache:
+    """Renders each HUD label once and re-renders it only when its text changes"""
+    def __init__(self):
+        self.entries = {}
+        self.renders = 0  # Font rasterizations so far, for profiling
+    
+    def get(self, key, text, font, color=WHITE):
+        """Surface for label key showing text"""
+        entry = self.entries.get(key)
+        if entry is None or entry[0] != text:
+            entry = (text, font.render(text, True, color))
+            self.entries[key] = entry
+            self.renders += 1
+        return entry[1]
+
+class DigitAtlas:
+    """Pre-rendered digit glyphs so a fast-changing number is drawn with blits only"""
+    def __init__(self, font, color=WHITE):
+        self.glyphs = {ch: font.render(ch, True, color) for ch in "0123456789-"}
+        self.height = max(glyph.get_height() for glyph in self.glyphs.values())
+    
+    def draw(self, screen, value, pos):
+        """Blit value's digits left to right from pos and return the rect they cover"""
+        x, y = pos
+        blits = []
+        for ch in str(value):
+            glyph = self.glyphs[ch]
+            blits.append((glyph, (x, y)))
+            x += glyph.get_width()
+        screen.blits(blits, doreturn=False)
+        return pygame.Rect(pos[0], y, x - pos[0], self.height)
+
+class SpatialHash:
+    """Uniform-grid broadphase over a list of collision rectangles"""
+    def __init__(self, rects, cell_size=COLLISION_CELL_SIZE):
+        self.rects = rects
+        self.cell_size = cell_size
+        self.cells = {}
+        for index, rect in enumerate(rects):
+            for key in self._cells_for(rect):
+                bucket = self.cells.get(key)
+                if bucket is None:
+                    self.cells[key] = [index]
+                else:
+                    bucket.append(index)
+
+    def _cells_for(self, rect):
+        """Grid cells covered by rect"""
+        size = self.cell_size
+        x0, x1 = rect.left // size, (rect.right - 1) // size
+        y0, y1 = rect.top // size, (rect.bottom - 1) // size
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                yield (cx, cy)
+
+    def candidates(self, rect):
+        """Indices of rects sharing at least one cell with rect"""
+        found = set()
+        for key in self._cells_for(rect):
+            bucket = self.cells.get(key)
+            if bucket:
+                found.update(bucket)
+        return found
+
+    def first_hit(self, targets, alive=None, accept=None):
+        """Lowest index whose rect overlaps any of targets, or -1.
+
+        accept(index, target number), when given, must also confirm each pair; it is
+        only called for rects that overlap (a narrowphase such as a mask test).
+        """
+        hit = -1
+        for number, target in enumerate(targets):
+            for index in self.candidates(target):
+                if (hit < 0 or index < hit) and (alive is None or alive[index]) \
+                        and target.colliderect(self.rects[index]) and (accept is None or accept(index, number)):
+                    hit = index
+        return hit
 
 class Game:
     """Main game class"""
-    def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("Space Shooter")
+    def __init__(self, backend="python", dirty_rects=False, seed=None, simulate_only=False, screen=None,
+                 display_scaling=DISPLAY_SCALING, fullscreen=False, rewind=False):
+        # "python" keeps one object per entity; "numpy" stores bullets, enemy bullets and
+        # stars in arrays (see vector_backend.py) and produces the same state for a seed
+        if backend not in ("python", "numpy"):
+            raise ValueError(f"unknown backend: {backend}")
+        self.vectorized = backend == "numpy"
+        
+        # All gameplay randomness comes from this generator, so a seed and the input reproduce a session
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+        self.star_rng = random.Random(f"stars-{self.seed}")  # Decorative only, so star density can vary freely
+        self.recorder = None  # InputRecorder while recording (see replay.py)
+        
+        # Simulation-only games (batch runs, see balance.py) open no window and never draw;
+        # games given a screen surface render into it offscreen instead (see env.py)
+        self.simulate_only = simulate_only
         self.clock = pygame.time.Clock()
-        self.font = pygame.font.Font(None, 36)
-        self.big_font = pygame.font.Font(None, 72)
+        self.profiler = FrameProfiler()
+        self.text = TextCache()
+        self.window = None  # Display surface the "integer" mode scales each frame into
+        self.window_scale = 1
+        if simulate_only:
+            self.screen = None
+            self.font = self.big_font = self.score_digits = None
+        else:
+            # Sprites and fonts decode behind a loading bar in a window; offscreen there is nothing to show
+            init_pygame()
+            loader = AssetLoader()
+            if screen is None:
+                self.screen = self.open_display(display_scaling, fullscreen)
+                pygame.display.set_caption("Space Shooter")
+                loader.start()
+                self.show_loading(loader)
+            else:
+                self.screen = screen
+                loader.load()
+            loader.wait()
+            self.font, self.big_font = loader.fonts
+            self.score_digits = DigitAtlas(self.font) if HUD_DIGIT_ATLAS else None
+        
+        # Dirty-rect rendering: erase and push only the regions drawn this frame or the last
+        self.dirty_rects = dirty_rects
+        self.drawn_rects = []
+        self.erased_rects = []
+        self.erased_area = 0
+        self.full_redraw = True
+        self.rendered_state = None
+        self.pushed_bytes = 0
         
         # Game state
         self.state = GameState.PLAYING
@@ -281,11 +954,15 @@ class Game:
         # Game objects - Two players
         self.player1 = Player(SCREEN_WIDTH // 2 - 60, SCREEN_HEIGHT - 50, 1)
         self.player2 = Player(SCREEN_WIDTH // 2 + 20, SCREEN_HEIGHT - 50, 2)
-        self.bullets = []
+        self.bullets = self.new_group(Bullet)
         self.enemies = []
-        self.enemy_bullets = []
+        self.enemy_bullets = self.new_group(EnemyBullet)
         self.asteroids = []
-        self.stars = []
+        self.stars = self.new_group(Star)
+        
+        # Recycled projectiles
+        self.bullet_pool = ObjectPool(lambda: Bullet(0, 0), BULLET_POOL_SIZE)
+        self.enemy_bullet_pool = ObjectPool(lambda: EnemyBullet(0, 0), ENEMY_BULLET_POOL_SIZE)
         
         # Spawning timers
         self.enemy_spawn_timer = 0
@@ -294,45 +971,125 @@ class Game:
         self.asteroid_spawn_delay = 120  # frames
         self.star_spawn_timer = 0
         self.star_spawn_delay = 2  # frames (spawn stars frequently)
+        self.enemy_shoot_delay = ENEMY_SHOOT_DELAY
+        
+        # Explosion, debris and engine-trail particles (needs NumPy; without it there are no effects)
+        self.particles = None
+        if not simulate_only:
+            try:
+                from particles import ParticleSystem
+                self.particles = ParticleSystem(SCREEN_WIDTH, SCREEN_HEIGHT, seed=self.seed)
+            except ImportError:
+                pass
+        
+        # Per-tick snapshots for rewinding (Backspace); only interactive play pays for them
+        self.rewind = None
+        if rewind and REWIND_SECONDS and not simulate_only:
+            self.rewind = SnapshotRing(REWIND_SECONDS * SIM_RATE)
+        
+        # Visual quality, lowered by the governor while frames run over budget
+        self.governor = QualityGovernor(len(QUALITY_LEVELS))
+        if not QUALITY_GOVERNOR:
+            self.governor.pin(0)
+        self.canvas = None  # Reduced-resolution world surface for render_scale < 1
+        self.set_quality(0)
         
         # Initialize starfield
         self.initialize_starfield()
     
+    def new_group(self, kind):
+        """Empty container for bullets, enemy bullets or stars under the selected backend"""
+        if not self.vectorized:
+            return []
+        from vector_backend import ArrayGroup
+        if kind is Bullet:
+            return ArrayGroup(Bullet, upward=True, limit=0, sprite=bullet_sprite)
+        if kind is EnemyBullet:
+            return ArrayGroup(EnemyBullet, upward=False, limit=SCREEN_HEIGHT, sprite=enemy_bullet_sprite)
+        return ArrayGroup(Star, upward=False, limit=SCREEN_HEIGHT, sprites=star_sprites,
+                          int_fields=("brightness", "size"))
+    
+    def add_projectile(self, group, pool, projectile):
+        """Add a pooled projectile to its group"""
+        group.append(projectile)
+        if self.vectorized:
+            pool.release(projectile)  # The arrays keep a copy, so the object is free again at once
+    
+    def clear_projectiles(self):
+        """Remove every bullet and enemy bullet, returning them to their pools"""
+        if self.vectorized:
+            self.bullets.clear()
+            self.enemy_bullets.clear()
+            return
+        self.bullet_pool.release_all(self.bullets)
+        self.bullets.clear()
+        self.enemy_bullet_pool.release_all(self.enemy_bullets)
+        self.enemy_bullets.clear()
+    
     def initialize_starfield(self):
         """Initialize the background starfield"""
         # Create initial stars across the screen
         for _ in range(50):  # Start with 50 stars
-            x = random.randint(0, SCREEN_WIDTH)
-            y = random.randint(0, SCREEN_HEIGHT)
-            self.stars.append(Star(x, y))
+            x = self.star_rng.randint(0, SCREEN_WIDTH)
+            y = self.star_rng.randint(0, SCREEN_HEIGHT)
+            self.stars.append(Star(x, y, self.star_rng))
         
-    def handle_events(self):
-        """Handle pygame events"""
-        for event in pygame.event.get():
+    def handle_events(self, events=None):
+        """Handle pygame events, or the given list of events (during a replay)"""
+        if events is None:
+            events = pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
                 return False
             elif event.type == pygame.KEYDOWN:
-                if self.state == GameState.PLAYING:
+                if self.recorder is not None and (event.key != pygame.K_BACKSPACE or self.rewind is not None):
+                    self.recorder.press(event.key)
+                if event.key == pygame.K_F3:
+                    # Toggle the performance overlay
+                    self.profiler.set_overlay(not self.profiler.overlay)
+                elif event.key == pygame.K_BACKSPACE and self.rewind is not None:
+                    # Jump back in time (also out of the game over screen)
+                    self.rewind.rewind(self, REWIND_STEP_SECONDS * SIM_RATE)
+                elif self.state == GameState.PLAYING:
                     if event.key == pygame.K_SPACE:
                         # Player 1 shoots
-                        bullet = Bullet(self.player1.x + self.player1.width // 2 - 2, self.player1.y)
-                        self.bullets.append(bullet)
+                        bullet = self.bullet_pool.acquire(self.player1.x + self.player1.width // 2 - 2, self.player1.y)
+                        self.add_projectile(self.bullets, self.bullet_pool, bullet)
                     elif event.key == pygame.K_RETURN:
                         # Player 2 shoots
-                        bullet = Bullet(self.player2.x + self.player2.width // 2 - 2, self.player2.y)
-                        self.bullets.append(bullet)
+                        bullet = self.bullet_pool.acquire(self.player2.x + self.player2.width // 2 - 2, self.player2.y)
+                        self.add_projectile(self.bullets, self.bullet_pool, bullet)
                 elif event.key == pygame.K_r and self.state == GameState.GAME_OVER:
                     # Restart game
                     self.restart_game()
         return True
     
-    def update(self):
-        """Update game logic"""
+    def update(self, keys=None):
+        """Update game logic for one simulation tick; keys defaults to the live keyboard state"""
+        if keys is None:
+            keys = pygame.key.get_pressed()
+        if self.recorder is not None:
+            self.recorder.tick(keys)
         if self.state != GameState.PLAYING:
             return
-            
+        prof = self.profiler
+        t = prof.clock()
+        self.move_entities(keys)
+        t = prof.lap("update", t)
+        self.check_collisions()
+        t = prof.lap("collisions", t)
+        if self.rewind is not None:
+            self.rewind.push(self)
+            prof.lap("snapshot", t)
+    
+    def move_entities(self, keys=None):
+        """Move players and entities and run spawning; keys defaults to the live keyboard state"""
+        prof = self.profiler
+        t = prof.clock()
+        
         # Handle player movement
-        keys = pygame.key.get_pressed()
+        if keys is None:
+            keys = pygame.key.get_pressed()
         
         # Player 1 movement (Arrow keys)
         dx1 = dy1 = 0
@@ -357,103 +1114,201 @@ class Game:
         if keys[pygame.K_s]:
             dy2 = 1
         self.player2.move(dx2, dy2)
+        t = prof.lap("update:players", t)
         
         # Update bullets
-        for bullet in self.bullets[:]:
-            bullet.update()
-            if bullet.is_off_screen():
-                self.bullets.remove(bullet)
+        update_entities(self.bullets, self.bullet_pool)
+        t = prof.lap("update:bullets", t)
         
         # Update enemy bullets
-        for bullet in self.enemy_bullets[:]:
-            bullet.update()
-            if bullet.is_off_screen():
-                self.enemy_bullets.remove(bullet)
+        update_entities(self.enemy_bullets, self.enemy_bullet_pool)
+        t = prof.lap("update:enemy_bullets", t)
         
         # Spawn enemies
         self.enemy_spawn_timer += 1
         if self.enemy_spawn_timer >= self.enemy_spawn_delay:
-            enemy = Enemy(random.randint(0, SCREEN_WIDTH - 30), -25)
+            enemy = Enemy(self.rng.randint(0, SCREEN_WIDTH - 30), -25, self.rng, self.enemy_shoot_delay)
             self.enemies.append(enemy)
             self.enemy_spawn_timer = 0
         
-        # Update enemies and handle shooting
-        for enemy in self.enemies[:]:
+        # Update enemies and handle shooting (compacting in place like update_entities)
+        kept = 0
+        for enemy in self.enemies:
             enemy.update()
             if enemy.is_off_screen():
-                self.enemies.remove(enemy)
-            elif enemy.can_shoot():
-                enemy_bullet = enemy.shoot()
-                self.enemy_bullets.append(enemy_bullet)
+                continue
+            if enemy.can_shoot():
+                enemy_bullet = enemy.shoot(self.enemy_bullet_pool, self.rng, self.enemy_shoot_delay)
+                self.add_projectile(self.enemy_bullets, self.enemy_bullet_pool, enemy_bullet)
+            self.enemies[kept] = enemy
+            kept += 1
+        del self.enemies[kept:]
+        t = prof.lap("update:enemies", t)
         
         # Spawn asteroids
         self.asteroid_spawn_timer += 1
         if self.asteroid_spawn_timer >= self.asteroid_spawn_delay:
-            asteroid = Asteroid(random.randint(0, SCREEN_WIDTH - 40), -40)
+            asteroid = Asteroid(self.rng.randint(0, SCREEN_WIDTH - 40), -40, self.rng)
             self.asteroids.append(asteroid)
             self.asteroid_spawn_timer = 0
         
         # Update asteroids
-        for asteroid in self.asteroids[:]:
-            asteroid.update()
-            if asteroid.is_off_screen():
-                self.asteroids.remove(asteroid)
-        
-        # Update stars
-        for star in self.stars[:]:
-            star.update()
-            if star.is_off_screen():
-                self.stars.remove(star)
-        
-        # Spawn new stars
+        update_entities(self.asteroids)
+        t = prof.lap("update:asteroids", t)
+        
+        self.update_stars()
+        t = prof.lap("update:stars", t)
+        
+        # Update particles and feed the engine trails
+        if self.effects:
+            self.particles.update()
+            for player in (self.player1, self.player2):
+                self.particles.emit(player.x + player.width / 2, player.y + player.height, 3, ORANGE,
+                                    speed=(1.0, 2.5), life=(8, 16), direction=math.pi / 2, spread=0.3)
+            prof.lap("update:particles", t)
+    
+    def update_stars(self):
+        """Scroll and spawn the background stars for one tick (network clients run only this)"""
+        update_entities(self.stars)
+        
+        # Spawn new star at top of screen
         self.star_spawn_timer += 1
         if self.star_spawn_timer >= self.star_spawn_delay:
-            # Spawn new star at top of screen
-            new_star = Star(random.randint(0, SCREEN_WIDTH), -5)
+            new_star = Star(self.star_rng.randint(0, SCREEN_WIDTH), -5, self.star_rng)
             self.stars.append(new_star)
             self.star_spawn_timer = 0
-        
-        # Check collisions
-        self.check_collisions()
     
     def check_collisions(self):
         """Check for collisions between game objects"""
-        # Bullet vs Enemy collisions
-        for bullet in self.bullets[:]:
-            for enemy in self.enemies[:]:
-                if bullet.get_rect().colliderect(enemy.get_rect()):
-                    self.bullets.remove(bullet)
-                    self.enemies.remove(enemy)
-                    self.score += 10
-                    break
+        # Collision rects are built once per entity per tick and indexed by a spatial hash
+        enemy_rects = [enemy.get_rect() for enemy in self.enemies]
+        enemy_grid = SpatialHash(enemy_rects)
+        
+        # Bullet vs Enemy collisions: each bullet destroys the first enemy (in list order) it overlaps
+        if self.bullets and self.enemies:
+            if self.vectorized:
+                enemy_alive = self.bullets.consume_hits(enemy_rects)
+            else:
+                enemy_alive = [True] * len(self.enemies)
+                surviving_bullets = []
+                for bullet in self.bullets:
+                    hit = enemy_grid.first_hit((bullet.get_rect(),), enemy_alive)
+                    if hit < 0:
+                        surviving_bullets.append(bullet)
+                    else:
+                        enemy_alive[hit] = False
+                        self.bullet_pool.release(bullet)
+                if len(surviving_bullets) != len(self.bullets):
+                    self.bullets[:] = surviving_bullets
+            kills = enemy_alive.count(False)
+            if kills:
+                if self.effects:
+                    for enemy, alive in zip(self.enemies, enemy_alive):
+                        if not alive:
+                            self.explode(enemy, 60, ORANGE)
+                self.enemies[:] = [enemy for enemy, alive in zip(self.enemies, enemy_alive) if alive]
+                enemy_rects = [rect for rect, alive in zip(enemy_rects, enemy_alive) if alive]
+                enemy_grid = SpatialHash(enemy_rects)
+                self.score += 10 * kills
         
         # Check if players are invulnerable
         if self.invulnerable_timer > 0:
             self.invulnerable_timer -= 1
             return  # Skip collision checks if invulnerable
         
-        # Check collisions for both players
-        for enemy in self.enemies:
-            if self.player1.get_rect().colliderect(enemy.get_rect()) or self.player2.get_rect().colliderect(enemy.get_rect()):
-                self.lose_life()
-                return
+        # Check collisions for both players; rect overlaps are confirmed with sprite masks
+        players = (self.player1, self.player2)
+        player_rects = tuple(player.get_rect() for player in players)
+        player_masks = [player.collision_mask() for player in players] if PIXEL_COLLISIONS else None
+        if enemy_grid.first_hit(player_rects, accept=self.mask_test(self.enemies, player_masks)) >= 0:
+            self.lose_life()
+            return
         
         # Player vs Enemy Bullet collisions
-        for bullet in self.enemy_bullets[:]:
-            if self.player1.get_rect().colliderect(bullet.get_rect()) or self.player2.get_rect().colliderect(bullet.get_rect()):
-                self.enemy_bullets.remove(bullet)  # Remove the bullet that hit
-                self.lose_life()
-                return
+        accept = self.mask_test(self.enemy_bullets, player_masks)
+        if self.vectorized:
+            hit = self.enemy_bullets.first_hit(player_rects, accept)
+        else:
+            hit = SpatialHash([bullet.get_rect() for bullet in self.enemy_bullets]).first_hit(player_rects, accept=accept)
+        if hit >= 0:
+            if not self.vectorized:
+                self.enemy_bullet_pool.release(self.enemy_bullets[hit])
+            del self.enemy_bullets[hit]  # Remove the bullet that hit
+            self.lose_life()
+            return
         
         # Player vs Asteroid collisions
-        for asteroid in self.asteroids:
-            if self.player1.get_rect().colliderect(asteroid.get_rect()) or self.player2.get_rect().colliderect(asteroid.get_rect()):
-                self.lose_life()
-                return
+        hit = SpatialHash([asteroid.get_rect() for asteroid in self.asteroids]).first_hit(
+            player_rects, accept=self.mask_test(self.asteroids, player_masks))
+        if hit >= 0:
+            if self.effects:
+                self.explode(self.asteroids[hit], 80, ASTEROID_COLOR)  # Debris from the asteroid
+            self.lose_life()
+            return
+    
+    def mask_test(self, group, player_masks):
+        """first_hit accept callback: does group[index]'s mask touch player number's? None without masks"""
+        if player_masks is None:
+            return None
+        if not isinstance(group, list):
+            # Vectorized groups hold bullets, which all share one sprite
+            mask = ASSETS.mask(group.sprite())
+            xs, ys = group.column("x"), group.column("y")
+            return lambda index, number: masks_overlap(*player_masks[number], mask, (int(xs[index]), int(ys[index])))
+        return lambda index, number: masks_overlap(*player_masks[number], *group[index].collision_mask())
+    
+    def explode(self, entity, count, color):
+        """Burst of particles from the centre of an entity"""
+        self.particles.emit(entity.x + entity.width / 2, entity.y + entity.height / 2, count, color)
+    
+    def snapshot_groups(self):
+        """(group, entity class, pool) of every entity group, in snapshot order"""
+        return ((self.bullets, Bullet, self.bullet_pool), (self.enemy_bullets, EnemyBullet, self.enemy_bullet_pool),
+                (self.enemies, Enemy, None), (self.asteroids, Asteroid, None))
+    
+    def snapshot(self):
+        """Full simulation state as compact bytes: a fixed header, the RNG state, then packed entity fields"""
+        _, rng_state, gauss = self.rng.getstate()
+        p1, p2 = self.player1, self.player2
+        groups = self.snapshot_groups()
+        header = SNAPSHOT_HEADER.pack(
+            self.state.value, self.score, self.lives, self.invulnerable_timer,
+            self.enemy_spawn_timer, self.enemy_spawn_delay, self.asteroid_spawn_timer, self.asteroid_spawn_delay,
+            self.star_spawn_timer,
+            p1.x, p1.y, p1.prev_x, p1.prev_y, p2.x, p2.y, p2.prev_x, p2.prev_y,
+            gauss is not None, gauss or 0.0, *(len(group) for group, _, _ in groups))
+        parts = [header, array("I", rng_state).tobytes()]
+        parts.extend(pack_entities(group, kind) for group, kind, _ in groups)
+        return b"".join(parts)
+    
+    def restore(self, snapshot):
+        """Return to the state captured by snapshot()"""
+        values = SNAPSHOT_HEADER.unpack_from(snapshot)
+        self.state = GameState(values[0])
+        (self.score, self.lives, self.invulnerable_timer,
+         self.enemy_spawn_timer, self.enemy_spawn_delay, self.asteroid_spawn_timer, self.asteroid_spawn_delay,
+         self.star_spawn_timer) = values[1:9]
+        for player, offset in ((self.player1, 9), (self.player2, 13)):
+            player.x, player.y, player.prev_x, player.prev_y = values[offset:offset + 4]
+        offset = SNAPSHOT_HEADER.size
+        rng_state = array("I")
+        rng_state.frombytes(snapshot[offset:offset + 625 * rng_state.itemsize])  # Mersenne Twister state
+        offset += 625 * rng_state.itemsize
+        self.rng.setstate((3, tuple(rng_state), values[18] if values[17] else None))
+        for (group, kind, pool), count in zip(self.snapshot_groups(), values[19:]):
+            size = count * entity_record(kind).size
+            load_entities(group, kind, snapshot[offset:offset + size], count, pool)
+            offset += size
+        if self.particles is not None:
+            self.particles.clear()
+        self.full_redraw = True
     
     def lose_life(self):
         """Handle player losing a life"""
         self.lives -= 1
+        if self.effects:
+            for player in (self.player1, self.player2):
+                self.explode(player, 150, player.color)
         if self.lives <= 0:
             self.state = GameState.GAME_OVER
         else:
@@ -462,18 +1317,45 @@ class Game:
             self.player2 = Player(SCREEN_WIDTH // 2 + 20, SCREEN_HEIGHT - 50, 2)
             self.invulnerable_timer = self.invulnerable_duration
             # Clear all bullets and enemies for a fresh start (keep stars)
-            self.bullets = []
-            self.enemy_bullets = []
+            self.clear_projectiles()
             self.enemies = []
             self.asteroids = []
     
-    def draw(self):
-        """Draw everything on screen"""
-        self.screen.fill(BLACK)
+    def draw(self, alpha=1.0):
+        """Draw everything on screen, interpolated alpha of the way into the current tick"""
+        self.render(alpha)
+        self.present()
+    
+    def render(self, alpha=1.0):
+        """Render the frame into the screen surface without presenting it"""
+        if self.state != GameState.PLAYING:
+            alpha = 1.0  # The simulation is paused, so there is nothing to interpolate
+        prof = self.profiler
+        t = prof.clock()
+        screen = self.screen
+        # Reduced-resolution quality levels draw the world into a smaller canvas and stretch it
+        scale = self.render_scale
+        world = self.canvas if scale != 1.0 else screen
+        
+        # Dirty-rect mode erases only what the previous frame drew; otherwise clear everything
+        if self.state != self.rendered_state:
+            self.full_redraw = True
+            self.rendered_state = self.state
+        if scale != 1.0:
+            self.full_redraw = True  # The stretched canvas covers the whole screen
+        if self.dirty_rects and not self.full_redraw:
+            for rect in self.drawn_rects:
+                screen.fill(BLACK, rect)
+            self.erased_rects = self.drawn_rects
+        else:
+            world.fill(BLACK)
+            self.erased_rects = []
+        drawn = self.drawn_rects = [] if self.dirty_rects else None
+        world_drawn = drawn if scale == 1.0 else None
         
         # Draw stars first (background)
-        for star in self.stars:
-            star.draw(self.screen)
+        draw_entities(self.stars, world, alpha, world_drawn, scale)
+        t = prof.lap("draw:stars", t)
         
         if self.state == GameState.PLAYING:
             # Draw game objects
@@ -482,32 +1364,45 @@ class Game:
                 # Flash effect during invulnerability
                 pass  # Don't draw players when flashing
             else:
-                self.player1.draw(self.screen)
-                self.player2.draw(self.screen)
+                draw_entities([self.player1, self.player2], world, alpha, world_drawn, scale)
+            t = prof.lap("draw:players", t)
             
-            for bullet in self.bullets:
-                bullet.draw(self.screen)
-            for bullet in self.enemy_bullets:
-                bullet.draw(self.screen)
-            for enemy in self.enemies:
-                enemy.draw(self.screen)
-            for asteroid in self.asteroids:
-                asteroid.draw(self.screen)
-            
-            # Draw score, lives, and controls
-            score_text = self.font.render(f"Score: {self.score}", True, WHITE)
-            lives_text = self.font.render(f"Lives: {self.lives}", True, WHITE)
-            controls_text = self.font.render("P1: Arrows+Space | P2: WASD+Enter", True, WHITE)
-            self.screen.blit(score_text, (10, 10))
-            self.screen.blit(lives_text, (10, 50))
-            self.screen.blit(controls_text, (10, 90))
+            draw_entities(self.bullets, world, alpha, world_drawn, scale)
+            t = prof.lap("draw:bullets", t)
+            draw_entities(self.enemy_bullets, world, alpha, world_drawn, scale)
+            t = prof.lap("draw:enemy_bullets", t)
+            draw_entities(self.enemies, world, alpha, world_drawn, scale)
+            t = prof.lap("draw:enemies", t)
+            draw_entities(self.asteroids, world, alpha, world_drawn, scale)
+            t = prof.lap("draw:asteroids", t)
+            if self.effects:
+                self.particles.draw(world, alpha, world_drawn)
+                t = prof.lap("draw:particles", t)
+        
+        if scale != 1.0:
+            # The HUD goes on top at full resolution so text stays sharp
+            pygame.transform.scale(world, screen.get_size(), screen)
+            t = prof.lap("draw:upscale", t)
+        
+        if self.state == GameState.PLAYING:
+            # Draw score, lives, and controls from cached text (re-rendered only when it changes)
+            text = self.text
+            if self.score_digits:
+                label = screen.blit(text.get("score_label", "Score: ", self.font), (10, 10))
+                score_rect = label.union(self.score_digits.draw(screen, self.score, label.topright))
+            else:
+                score_rect = screen.blit(text.get("score", f"Score: {self.score}", self.font), (10, 10))
+            hud = [score_rect,
+                   screen.blit(text.get("lives", f"Lives: {self.lives}", self.font), (10, 50)),
+                   screen.blit(text.get("controls", CONTROLS_TEXT, self.font), (10, 90))]
             
         elif self.state == GameState.GAME_OVER:
             # Draw game over screen
-            game_over_text = self.big_font.render("GAME OVER", True, RED)
-            score_text = self.font.render(f"Final Score: {self.score}", True, WHITE)
-            lives_text = self.font.render(f"Lives Lost: {3 - self.lives}", True, WHITE)
-            restart_text = self.font.render("Press R to Restart", True, WHITE)
+            text = self.text
+            game_over_text = text.get("game_over", "GAME OVER", self.big_font, RED)
+            score_text = text.get("final_score", f"Final Score: {self.score}", self.font)
+            lives_text = text.get("lives_lost", f"Lives Lost: {3 - self.lives}", self.font)
+            restart_text = text.get("restart", "Press R to Restart", self.font)
             
             # Center the text
             game_over_rect = game_over_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 80))
@@ -515,12 +1410,155 @@ class Game:
             lives_rect = lives_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 20))
             restart_rect = restart_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 60))
             
-            self.screen.blit(game_over_text, game_over_rect)
-            self.screen.blit(score_text, score_rect)
-            self.screen.blit(lives_text, lives_rect)
-            self.screen.blit(restart_text, restart_rect)
+            hud = [screen.blit(game_over_text, game_over_rect),
+                   screen.blit(score_text, score_rect),
+                   screen.blit(lives_text, lives_rect),
+                   screen.blit(restart_text, restart_rect)]
+        if drawn is not None:
+            drawn.extend(hud)
+        prof.lap("draw:hud", t)
+    
+    def frame_counters(self):
+        """Live entity counts per group, projectile pool usage and bytes pushed to the display"""
+        return {
+            "bullets_count": len(self.bullets),
+            "enemy_bullets_count": len(self.enemy_bullets),
+            "enemies_count": len(self.enemies),
+            "asteroids_count": len(self.asteroids),
+            "stars_count": len(self.stars),
+            "particles_count": len(self.particles) if self.particles is not None else 0,
+            "quality_level": self.quality_level,
+            "pooled_bullets": self.bullet_pool.allocated,
+            "pooled_enemy_bullets": self.enemy_bullet_pool.allocated,
+            "pushed_bytes": self.pushed_bytes,
+        }
+    
+    def overlay_lines(self):
+        """Extra counters shown on the performance overlay"""
+        lines = []
+        for name, pool in (("bullet pool", self.bullet_pool), ("enemy bullet pool", self.enemy_bullet_pool)):
+            stats = pool.stats()
+            lines.append(f"{name}: live={stats['live']} free={stats['free']} hw={stats['high_water']}")
+        lines.append(f"text renders: {self.text.renders}")
+        governor = self.governor
+        lines.append(f"quality: level {self.quality_level}/{governor.max_level}"
+                     + (" (pinned)" if governor.pinned else f", {governor.changes} changes"))
+        if self.rewind is not None:
+            stats = self.rewind.stats()
+            lines.append(f"rewind: {stats['snapshots']} x {stats['mean_bytes'] / 1024:.1f} KiB = "
+                         f"{stats['bytes'] / 2 ** 20:.1f} MiB, capture {stats['capture_us']:.0f} us, "
+                         f"restore {stats['restore_us']:.0f} us")
+        return lines
+    
+    def show_loading(self, loader):
+        """Draw a progress bar until the loader's thread finishes, keeping the window responsive"""
+        screen = self.screen
+        bar = pygame.Rect(0, 0, SCREEN_WIDTH // 2, 8)
+        bar.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+        while not loader.finished():
+            pygame.event.pump()  # Queued input, including quitting, is handled once the game starts
+            screen.fill(BLACK)
+            pygame.draw.rect(screen, WHITE, bar.inflate(4, 4), 1)
+            screen.fill(WHITE, (bar.x, bar.y, int(bar.w * loader.progress()), bar.h))
+            self.push()
+            loader.wait(LOADING_FRAME_TIME)
+    
+    def open_display(self, scaling, fullscreen):
+        """Open the window and return the SCREEN_WIDTH x SCREEN_HEIGHT surface frames are rendered into"""
+        if scaling not in ("scaled", "integer", "native"):
+            raise ValueError(f"unknown display scaling: {scaling}")
+        size = (SCREEN_WIDTH, SCREEN_HEIGHT)
+        flags = pygame.FULLSCREEN if fullscreen else 0
+        if scaling == "scaled":
+            try:
+                return pygame.display.set_mode(size, flags | pygame.SCALED)
+            except pygame.error:
+                scaling = "integer"  # No renderer for this driver; scale in software instead
+        if scaling == "native":
+            return pygame.display.set_mode(size, flags)
+        
+        if fullscreen:
+            window = pygame.display.set_mode((0, 0), flags)
+        else:
+            desktop_width, desktop_height = pygame.display.get_desktop_sizes()[0]
+            factor = max(1, min(desktop_width // SCREEN_WIDTH, desktop_height // SCREEN_HEIGHT))
+            window = pygame.display.set_mode((SCREEN_WIDTH * factor, SCREEN_HEIGHT * factor))
+        self.window_scale = max(1, min(window.get_width() // SCREEN_WIDTH, window.get_height() // SCREEN_HEIGHT))
+        if window.get_size() == size:
+            return window  # Nothing to scale
+        self.window = window
+        self.window_rect = pygame.Rect(0, 0, SCREEN_WIDTH * self.window_scale, SCREEN_HEIGHT * self.window_scale)
+        self.window_rect.center = window.get_rect().center
+        window.fill(BLACK)  # Borders around the scaled frame stay black
+        return pygame.Surface(size, 0, window)
+    
+    def present(self):
+        """Push the rendered frame to the display, only the changed regions in dirty-rect mode"""
+        screen = self.screen
+        full_area = screen.get_width() * screen.get_height()
+        area = full_area
+        if self.dirty_rects:
+            bounds = screen.get_rect()
+            drawn_area = 0
+            for rect in self.drawn_rects:
+                clipped = rect.clip(bounds)
+                drawn_area += clipped.w * clipped.h
+            limit = full_area * DIRTY_RECT_MAX_COVERAGE
+            if not self.full_redraw and self.erased_area + drawn_area <= limit:
+                # Regions drawn last frame (now erased) plus regions drawn this frame
+                self.push(self.erased_rects + self.drawn_rects)
+                area = self.erased_area + drawn_area
+            else:
+                self.push()
+            # A crowded screen is cheaper to clear and push whole next frame
+            self.full_redraw = drawn_area * 2 > limit
+            self.erased_area = drawn_area
+        else:
+            self.push()
+        self.pushed_bytes = area * screen.get_bytesize() * self.window_scale ** 2
+    
+    def push(self, rects=None):
+        """Show the whole frame, or only rects of it, scaling into the window in "integer" mode"""
+        window = self.window
+        if window is None:
+            if rects is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(rects)
+            return
         
-        pygame.display.flip()
+        screen = self.screen
+        if rects is None:
+            pygame.transform.scale(screen, self.window_rect.size, window.subsurface(self.window_rect))
+            pygame.display.flip()
+            return
+        scale = self.window_scale
+        left, top = self.window_rect.topleft
+        bounds = screen.get_rect()
+        updated = []
+        for rect in rects:
+            rect = rect.clip(bounds)
+            if rect.w and rect.h:
+                target = pygame.Rect(left + rect.x * scale, top + rect.y * scale, rect.w * scale, rect.h * scale)
+                pygame.transform.scale(screen.subsurface(rect), target.size, window.subsurface(target))
+                updated.append(target)
+        pygame.display.update(updated)
+    
+    def set_quality(self, level):
+        """Apply QUALITY_LEVELS[level]; only presentation changes, never gameplay state"""
+        settings = QUALITY_LEVELS[level]
+        self.quality_level = level
+        self.star_spawn_delay = settings["star_spawn_delay"]
+        ASSETS.set_rotation_steps(settings["rotation_steps"])
+        self.effects = settings["effects"] and self.particles is not None
+        if not self.effects and self.particles is not None:
+            self.particles.clear()
+        self.render_scale = settings["render_scale"]
+        if self.render_scale != 1.0 and self.screen is not None:
+            size = (int(SCREEN_WIDTH * self.render_scale), int(SCREEN_HEIGHT * self.render_scale))
+            if self.canvas is None or self.canvas.get_size() != size:
+                self.canvas = pygame.Surface(size, 0, self.screen)
+        self.full_redraw = True
     
     def restart_game(self):
         """Restart the game"""
@@ -530,29 +1568,170 @@ class Game:
         self.invulnerable_timer = 0
         self.player1 = Player(SCREEN_WIDTH // 2 - 60, SCREEN_HEIGHT - 50, 1)
         self.player2 = Player(SCREEN_WIDTH // 2 + 20, SCREEN_HEIGHT - 50, 2)
-        self.bullets = []
+        self.clear_projectiles()
         self.enemies = []
-        self.enemy_bullets = []
         self.asteroids = []
-        self.stars = []
+        self.stars = self.new_group(Star)
+        if self.particles is not None:
+            self.particles.clear()
         self.enemy_spawn_timer = 0
         self.asteroid_spawn_timer = 0
         self.star_spawn_timer = 0
         # Reinitialize starfield
         self.initialize_starfield()
     
-    def run(self):
-        """Main game loop"""
+    def run(self, fps=FPS, trace_path=None, record_path=None):
+        """Main game loop: fixed-rate simulation ticks, variable-rate interpolated rendering"""
         running = True
+        accumulator = 0.0
+        previous = time.perf_counter()
         while running:
+            now = time.perf_counter()
+            accumulator += min(now - previous, MAX_FRAME_TIME)
+            previous = now
+            
+            prof = self.profiler
+            prof.begin_frame()
+            t = prof.clock()
             running = self.handle_events()
-            self.update()
-            self.draw()
-            self.clock.tick(FPS)
+            prof.lap("events", t)
+            while accumulator >= SIM_DT:
+                self.update()
+                accumulator -= SIM_DT
+            if self.recorder is not None:
+                self.recorder.end_frame()
+            t = prof.clock()
+            self.render(accumulator / SIM_DT)
+            if prof.overlay:
+                panel = prof.draw_overlay(self.screen, self.overlay_lines())
+                if self.dirty_rects:
+                    self.drawn_rects.append(panel)
+            t = prof.lap("draw", t)
+            self.present()
+            prof.lap("flip", t)
+            prof.end_frame(self.frame_counters())
+            # Work time this frame, excluding the frame-cap wait
+            if self.governor.observe((time.perf_counter() - now) * 1000):
+                self.set_quality(self.governor.level)
+            self.clock.tick(fps)
+        
+        self.finish(trace_path, record_path)
+    
+    def rewind_ticks(self):
+        """Length of the rewind history in ticks, 0 without one"""
+        return self.rewind.snapshots.maxlen if self.rewind is not None else 0
+    
+    def start_recording(self):
+        """Record every frame's input from now on (see replay.py)"""
+        from replay import InputRecorder
+        self.recorder = InputRecorder(self.seed, SIM_RATE, self.rewind_ticks())
+    
+    def replay(self, recording, fps=FPS):
+        """Play an InputReplay back through handle_events/update and return run statistics.
+        
+        fps=0 runs uncapped (as fast as possible, e.g. headless for regression runs);
+        otherwise frames are paced to the recorded simulation time.
+        """
+        if recording.seed != self.seed:
+            raise ValueError(f"replay was recorded with seed {recording.seed}, game uses {self.seed}")
+        if recording.sim_rate != SIM_RATE:
+            raise ValueError(f"replay was recorded at {recording.sim_rate} Hz, game runs at {SIM_RATE} Hz")
+        if recording.rewind_ticks != self.rewind_ticks():
+            raise ValueError(f"replay was recorded with a {recording.rewind_ticks}-tick rewind history, "
+                             f"game keeps {self.rewind_ticks()} (see Game(rewind=...))")
+        prof = self.profiler
+        frames = ticks = 0
+        start = time.perf_counter()
+        for presses, tick_keys in recording.frames():
+            if pygame.event.get(pygame.QUIT):
+                break  # Live input is ignored, except for closing the window
+            prof.begin_frame()
+            t = prof.clock()
+            self.handle_events([pygame.event.Event(pygame.KEYDOWN, key=key) for key in presses])
+            prof.lap("events", t)
+            for keys in tick_keys:
+                self.update(keys)
+            t = prof.clock()
+            self.render()
+            if prof.overlay:
+                panel = prof.draw_overlay(self.screen, self.overlay_lines())
+                if self.dirty_rects:
+                    self.drawn_rects.append(panel)
+            t = prof.lap("draw", t)
+            self.present()
+            prof.lap("flip", t)
+            prof.end_frame(self.frame_counters())
+            frames += 1
+            ticks += len(tick_keys)
+            if fps:
+                # Real time: wait until the wall clock catches up with the simulation
+                delay = start + ticks * SIM_DT - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+        elapsed = time.perf_counter() - start
+        return {"frames": frames, "ticks": ticks, "seconds": elapsed,
+                "fps": frames / elapsed if elapsed else 0.0, "score": self.score, "lives": self.lives}
+    
+    def finish(self, trace_path=None, record_path=None):
+        """Write the trace and recording, then shut pygame down and exit"""
+        if trace_path:
+            self.profiler.write_trace(trace_path)
+        if record_path and self.recorder is not None:
+            self.recorder.save(record_path)
         
         pygame.quit()
         sys.exit()
 
 if __name__ == "__main__":
-    game = Game()
-    game.run()
+    import argparse
+    parser = argparse.ArgumentParser(description="Space Shooter")
+    parser.add_argument("--backend", choices=("python", "numpy"), default="python",
+                        help="entity simulation backend (numpy requires NumPy)")
+    parser.add_argument("--fps", type=int, default=FPS,
+                        help=f"render frame cap; the simulation always runs at {SIM_RATE} Hz (0 = uncapped)")
+    parser.add_argument("--profile", action="store_true", help="start with the performance overlay shown (F3 toggles)")
+    parser.add_argument("--trace", metavar="PATH", help="record every frame's timings to PATH (.json or .csv) on exit")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="redraw and push only changed screen regions (lower CPU on software rendering)")
+    parser.add_argument("--display", choices=("scaled", "integer", "native"), default=DISPLAY_SCALING,
+                        help="how the 800x600 frame is scaled up to the window (see DISPLAY_SCALING)")
+    parser.add_argument("--fullscreen", action="store_true", help="fill the screen, keeping the aspect ratio")
+    parser.add_argument("--quality", type=int, choices=range(len(QUALITY_LEVELS)),
+                        help="pin a quality level (0 = best) instead of adapting to the frame budget")
+    parser.add_argument("--seed", type=int, help="random seed (default: random; recordings store their own)")
+    parser.add_argument("--record", metavar="PATH", help="record the session's input to PATH on exit")
+    parser.add_argument("--replay", metavar="PATH", help="play back a recording made with --record")
+    parser.add_argument("--headless", action="store_true",
+                        help="with --replay: no window and no frame cap, for replaying regression runs as fast as possible")
+    args = parser.parse_args()
+    if args.headless and not args.replay:
+        parser.error("--headless needs --replay (there is no one to play a game without a window)")
+    if args.headless:
+        # Nothing has initialized the display yet (see init_pygame), so SDL picks this driver up
+        import os
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        args.display = "native"  # Nothing is shown, so skip scaling
+    
+    recording = None
+    seed = args.seed
+    if args.replay:
+        from replay import InputReplay
+        recording = InputReplay(args.replay)
+        seed = recording.seed
+    game = Game(backend=args.backend, dirty_rects=args.dirty_rects, seed=seed,
+                display_scaling=args.display, fullscreen=args.fullscreen,
+                rewind=recording.rewind_ticks > 0 if recording is not None else True)
+    if args.trace:
+        game.profiler.start_trace()
+    game.profiler.set_overlay(args.profile)
+    if args.quality is not None:
+        game.governor.pin(args.quality)
+        game.set_quality(args.quality)
+    if recording is not None:
+        stats = game.replay(recording, 0 if args.headless else args.fps)
+        print(f"replayed {stats['frames']} frames ({stats['ticks']} ticks) in {stats['seconds']:.2f} s, "
+              f"{stats['fps']:.0f} FPS, final score {stats['score']}, lives {stats['lives']}")
+        game.finish(args.trace)
+    if args.record:
+        game.start_recording()
+    game.run(args.fps, args.trace, args.record)
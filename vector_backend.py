@@ -0,0 +1,169 @@
+"""Optional NumPy backend for the simple linear movers (bullets, enemy bullets, stars).
+
+Each group keeps its entities' fields in contiguous arrays, advances them with
+one vectorized operation per tick, culls off-screen items with a boolean mask
+and runs AABB tests against other groups as batched array operations. Entities
+are appended as ordinary objects so spawning consumes the game's random generator
+exactly like the default backend, which keeps both backends in lockstep for a seed.
+"""
+import numpy as np
+
+
+def rect_array(rects):
+    """(n, 4) int array of x, y, w, h for a sequence of pygame.Rect"""
+    if not rects:
+        return np.zeros((0, 4), dtype=np.int64)
+    return np.array([(r.x, r.y, r.w, r.h) for r in rects], dtype=np.int64)
+
+
+class ArrayGroup:
+    """Structure-of-arrays storage for one kind of linear mover"""
+    def __init__(self, kind, upward, limit, sprite=None, sprites=None, int_fields=(), capacity=256):
+        self.kind = kind  # entity class, used to read appended objects
+        self.fields = tuple(name for name in kind.__slots__ if name != "sprite")  # Sprites come from sprite(s)
+        self.upward = upward  # True moves by -speed and culls above 0, else +speed and culls below limit
+        self.limit = limit
+        self.sprite = sprite  # Returns the one surface every entity is drawn with
+        self.sprites = sprites  # Or returns a [size][brightness] table of surfaces, for stars
+        self.int_fields = int_fields
+        self.count = 0
+        self.arrays = {name: np.zeros(capacity, dtype=np.int64 if name in int_fields else np.float64)
+                       for name in self.fields}
+
+    def __len__(self):
+        return self.count
+
+    def __delitem__(self, index):
+        """Remove one entity, keeping the order of the rest"""
+        n = self.count
+        for array in self.arrays.values():
+            array[index:n - 1] = array[index + 1:n]
+        self.count -= 1
+
+    def column(self, name):
+        """Live view of one field over the active entities"""
+        return self.arrays[name][:self.count]
+
+    def reserve(self, count):
+        """Grow the arrays (doubling) until they hold at least count entities"""
+        size = len(self.arrays["x"])
+        if count <= size:
+            return
+        while size < count:
+            size *= 2
+        for name, array in self.arrays.items():
+            grown = np.zeros(size, dtype=array.dtype)
+            grown[:self.count] = array[:self.count]
+            self.arrays[name] = grown
+
+    def append(self, entity):
+        """Copy an entity's fields into the arrays, growing them when full"""
+        self.reserve(self.count + 1)
+        for name in self.fields:
+            self.arrays[name][self.count] = getattr(entity, name)
+        self.count += 1
+
+    def records(self, dtype):
+        """Every entity's fields as a structured array of dtype (one named field per entity field), for snapshots"""
+        records = np.empty(self.count, dtype=dtype)
+        for name in self.fields:
+            records[name] = self.column(name)
+        return records
+
+    def load(self, records):
+        """Replace every entity with those of a structured array like records() returns"""
+        self.count = 0
+        self.reserve(len(records))
+        for name in self.fields:
+            self.arrays[name][:len(records)] = records[name]
+        self.count = len(records)
+
+    def clear(self):
+        """Drop every entity, keeping the allocated arrays"""
+        self.count = 0
+
+    def compact(self, keep):
+        """Keep only the entities where the boolean mask is set, preserving order"""
+        kept = int(np.count_nonzero(keep))
+        if kept != self.count:
+            for array in self.arrays.values():
+                array[:kept] = array[:self.count][keep]
+            self.count = kept
+
+    def update(self):
+        """Advance every entity by its speed and cull the ones that left the screen"""
+        y = self.column("y")
+        speed = self.column("speed")
+        self.column("prev_y")[:] = y
+        if self.upward:
+            y -= speed
+            self.compact(y >= 0)
+        else:
+            y += speed
+            self.compact(y <= self.limit)
+
+    def rects(self):
+        """(n, 4) int array of collision rects, truncated like pygame.Rect"""
+        return np.stack([np.trunc(self.column(name)).astype(np.int64)
+                         for name in ("x", "y", "width", "height")], axis=1)
+
+    def consume_hits(self, target_rects):
+        """Each entity destroys the first live target it overlaps; return the targets' alive flags"""
+        alive = [True] * len(target_rects)
+        if not self.count or not target_rects:
+            return alive
+        overlap = overlap_matrix(self.rects(), rect_array(target_rects))
+        rows = np.flatnonzero(overlap.any(axis=1))
+        if not len(rows):
+            return alive
+        alive_mask = np.ones(len(target_rects), dtype=bool)
+        keep = np.ones(self.count, dtype=bool)
+        for row in rows:
+            hits = np.flatnonzero(overlap[row] & alive_mask)
+            if len(hits):
+                alive_mask[hits[0]] = False
+                keep[row] = False
+        self.compact(keep)
+        return alive_mask.tolist()
+
+    def first_hit(self, target_rects, accept=None):
+        """Lowest index whose rect overlaps any of target_rects, or -1.
+
+        accept(index, target number), when given, must also confirm each overlapping pair.
+        """
+        if not self.count:
+            return -1
+        overlap = overlap_matrix(self.rects(), rect_array(target_rects))
+        hits = overlap.any(axis=1)
+        if accept is None:
+            return int(np.argmax(hits)) if hits.any() else -1
+        for index in np.flatnonzero(hits).tolist():
+            for number in np.flatnonzero(overlap[index]).tolist():
+                if accept(index, number):
+                    return index
+        return -1
+
+    def blit_batch(self, alpha=1.0):
+        """(surface, position) for every entity, alpha of the way from its previous to its current position"""
+        x = self.column("x")
+        prev_y = self.column("prev_y")
+        y = prev_y + (self.column("y") - prev_y) * alpha
+        if self.sprite is not None:
+            surface = self.sprite()
+            batch = [(surface, pos) for pos in zip(x.tolist(), y.tolist())]
+        else:
+            # Stars are centred on their truncated position, like pygame.draw.circle
+            table = self.sprites()
+            batch = [(table[size][brightness], (px - size, py - size))
+                     for px, py, brightness, size in zip(np.trunc(x).astype(np.int64).tolist(),
+                                                         np.trunc(y).astype(np.int64).tolist(),
+                                                         self.column("brightness").tolist(),
+                                                         self.column("size").tolist())]
+        return batch
+
+
+def overlap_matrix(a, b):
+    """Boolean (len(a), len(b)) matrix of pygame.Rect.colliderect between two rect arrays"""
+    ax, ay, aw, ah = (a[:, i, None] for i in range(4))
+    bx, by, bw, bh = (b[None, :, i] for i in range(4))
+    return (ax < bx + bw) & (ay < by + bh) & (ax + aw > bx) & (ay + ah > by)